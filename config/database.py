@@ -1,5 +1,7 @@
 import os
 import logging
+import threading
+import time
 import mysql.connector
 from mysql.connector import Error as MySQLError
 import sqlite3
@@ -15,61 +17,200 @@ class MySQLDatabase:
     def __init__(self) -> None:
         self.connection: Optional[mysql.connector.MySQLConnection] = None
         self.is_connected: bool = False
-    
+
+        # mysql.connector connections are NOT thread-safe, and the
+        # attendance pool, activity writer and sync worker all share this
+        # one - every operation that touches the connection (or a cached
+        # cursor) runs under this lock. RLock because fetch_all may
+        # reconnect mid-call.
+        self._lock = threading.RLock()
+
+        # Prepared-statement cursors keyed by tag - the server parses and
+        # plans each hot statement once, later executions are binary-
+        # protocol round-trips. Cleared on reconnect (cursors die with
+        # their connection). Guarded by _lock: two threads sharing a
+        # cursor mid-conversation desyncs the protocol.
+        self._prepared: Dict[str, Any] = {}
+
+        # Reconnect backoff (1s doubling to 60s) and ping throttling -
+        # doomed TCP connects on a flaky network must not stall the sync
+        # worker for seconds every interval
+        self._reconnect_delay = 1.0
+        self._next_reconnect_at = 0.0
+        self._last_ping = 0.0
+
     def connect(self) -> bool:
         """Establish MySQL connection"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=Config.MYSQL_HOST,
-                port=Config.MYSQL_PORT,
-                user=Config.MYSQL_USER,
-                password=Config.MYSQL_PASSWORD,
-                database=Config.MYSQL_DATABASE,
-                autocommit=True
-            )
-            self.is_connected = True
-            logger.info("MySQL connected")
+        with self._lock:
+            try:
+                self.connection = mysql.connector.connect(
+                    host=Config.MYSQL_HOST,
+                    port=Config.MYSQL_PORT,
+                    user=Config.MYSQL_USER,
+                    password=Config.MYSQL_PASSWORD,
+                    database=Config.MYSQL_DATABASE,
+                    autocommit=True
+                )
+                self._prepared.clear()
+                self.is_connected = True
+                logger.info("MySQL connected")
+                return True
+            except MySQLError as e:
+                logger.error(f"MySQL connection failed: {e}")
+                self.is_connected = False
+                return False
+    
+    def try_reconnect(self) -> bool:
+        """connect() gated by exponential backoff"""
+        now = time.monotonic()
+        if now < self._next_reconnect_at:
+            return False
+
+        if self.connect():
+            self._reconnect_delay = 1.0
             return True
-        except MySQLError as e:
-            logger.error(f"MySQL connection failed: {e}")
-            self.is_connected = False
+
+        self._reconnect_delay = min(self._reconnect_delay * 2, 60.0)
+        self._next_reconnect_at = time.monotonic() + self._reconnect_delay
+        return False
+
+    def ping(self, max_age: float = 30.0) -> bool:
+        """Verify the connection is actually alive (throttled to max_age)"""
+        if not self.is_connected or self.connection is None:
             return False
-    
+
+        now = time.monotonic()
+        if now - self._last_ping < max_age:
+            return True
+
+        with self._lock:
+            try:
+                self.connection.ping(reconnect=False)
+                self._last_ping = now
+                return True
+            except MySQLError as e:
+                logger.warning(f"MySQL ping failed: {e}")
+                self.is_connected = False
+                return False
+
     def execute_query(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
         """Execute INSERT/UPDATE/DELETE"""
         if not self.is_connected or self.connection is None:
             logger.warning("MySQL not connected")
             return None
         
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            last_id = cursor.lastrowid
-            cursor.close()
-            return last_id
-        except MySQLError as e:
-            logger.error(f"Query failed: {e}")
-            self.is_connected = False
-            return None
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, params or ())
+                last_id = cursor.lastrowid
+                cursor.close()
+                return last_id
+            except MySQLError as e:
+                logger.error(f"Query failed: {e}")
+                self.is_connected = False
+                return None
     
+    def execute_many(self, query: str, rows: List[tuple]) -> bool:
+        """Execute one INSERT/UPDATE for many parameter rows in a single call"""
+        if not self.is_connected or self.connection is None:
+            logger.warning("MySQL not connected")
+            return False
+
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.executemany(query, rows)
+                cursor.close()
+                return True
+            except MySQLError as e:
+                logger.error(f"Batch query failed: {e}")
+                self.is_connected = False
+                return False
+
+    def _prepared_cursor(self, tag: str):
+        """Get (or lazily create) the prepared cursor for a statement tag"""
+        cursor = self._prepared.get(tag)
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True)
+            self._prepared[tag] = cursor
+        return cursor
+
+    def execute_prepared(self, tag: str, query: str,
+                         params: Optional[tuple] = None) -> Optional[int]:
+        """Execute INSERT/UPDATE/DELETE through a cached prepared statement"""
+        if not self.is_connected or self.connection is None:
+            logger.warning("MySQL not connected")
+            return None
+
+        with self._lock:
+            try:
+                cursor = self._prepared_cursor(tag)
+                cursor.execute(query, params or ())
+                return cursor.lastrowid
+            except MySQLError as e:
+                logger.error(f"Prepared query failed: {e}")
+                self._prepared.pop(tag, None)
+                self.is_connected = False
+                return None
+
+    def fetch_one_prepared(self, tag: str, query: str,
+                           params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Fetch a single row through a cached prepared statement"""
+        if not self.is_connected or self.connection is None:
+            logger.warning("MySQL not connected")
+            return None
+
+        with self._lock:
+            try:
+                cursor = self._prepared_cursor(tag)
+                cursor.execute(query, params or ())
+                rows = cursor.fetchall()
+                if not rows:
+                    return None
+                return dict(zip(cursor.column_names, rows[0]))
+            except MySQLError as e:
+                logger.error(f"Prepared fetch failed: {e}")
+                self._prepared.pop(tag, None)
+                return None
+
+    def call_proc(self, name: str, args: tuple) -> Optional[tuple]:
+        """Call a stored procedure, returning the resolved argument tuple"""
+        if not self.is_connected or self.connection is None:
+            logger.warning("MySQL not connected")
+            return None
+
+        with self._lock:
+            try:
+                cursor = self.connection.cursor()
+                result = cursor.callproc(name, args)
+                cursor.close()
+                return result
+            except MySQLError as e:
+                # Missing procedure is expected on undeployed servers - callers
+                # fall back to plain statements
+                logger.warning(f"Procedure {name} failed: {e}")
+                return None
+
     def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Fetch multiple rows"""
-        if not self.is_connected:
-            if not self.connect():
+        with self._lock:
+            if not self.is_connected:
+                if not self.connect():
+                    return []
+
+            if self.connection is None:
+                return []
+
+            try:
+                cursor = self.connection.cursor(dictionary=True)
+                cursor.execute(query, params or ())
+                results = cursor.fetchall()
+                cursor.close()
+                return results if results else []
+            except MySQLError as e:
+                logger.error(f"Fetch failed: {e}")
                 return []
-        
-        if self.connection is None:
-            return []
-        
-        try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            results = cursor.fetchall()
-            cursor.close()
-            return results if results else []
-        except MySQLError as e:
-            logger.error(f"Fetch failed: {e}")
-            return []
     
     def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
         """Fetch single row"""
@@ -78,10 +219,11 @@ class MySQLDatabase:
     
     def close(self) -> None:
         """Close connection"""
-        if self.connection:
-            self.connection.close()
-            self.is_connected = False
-            logger.info("MySQL closed")
+        with self._lock:
+            if self.connection:
+                self.connection.close()
+                self.is_connected = False
+                logger.info("MySQL closed")
 
 
 class SQLiteDatabase:
@@ -89,15 +231,35 @@ class SQLiteDatabase:
     
     def __init__(self) -> None:
         self.db_path: str = Config.SQLITE_PATH
+
+        # One long-lived connection per thread: SQLite in WAL mode handles
+        # readers concurrently with the single writer, and reusing the
+        # connection skips the open/close + pragma cost on every call
+        self._local = threading.local()
         self._init_database()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating and tuning it once"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            # WAL: writes append to the log, readers never block on them;
+            # synchronous=NORMAL skips the per-transaction fsync
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=67108864")
+            self._local.conn = conn
+        return conn
+
     def _init_database(self) -> None:
         """Create tables"""
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Attendance buffer
@@ -111,6 +273,7 @@ class SQLiteDatabase:
                 status TEXT DEFAULT 'present',
                 hours_worked REAL DEFAULT 0,
                 sync_status TEXT DEFAULT 'pending',
+                retry_count INTEGER DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 synced_at TIMESTAMP
             )
@@ -130,6 +293,20 @@ class SQLiteDatabase:
             )
         """)
         
+        # Databases created before the retry_count column gain it here
+        try:
+            cursor.execute(
+                "ALTER TABLE attendance_buffer ADD COLUMN retry_count INTEGER DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            pass  # column already exists
+
+        # Lets the sync fetch skip over-retried rows without a scan
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_buffer_pending
+            ON attendance_buffer (sync_status, retry_count)
+        """)
+
         # System logs
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS system_events (
@@ -141,7 +318,6 @@ class SQLiteDatabase:
         """)
         
         conn.commit()
-        conn.close()
         logger.info("SQLite initialized")
     
     def insert_attendance(self, worker_id: int, attendance_date: str, 
@@ -149,7 +325,7 @@ class SQLiteDatabase:
                          time_out: Optional[str] = None,
                          status: str = 'present') -> int:
         """Insert attendance to buffer"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -160,7 +336,6 @@ class SQLiteDatabase:
         
         last_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         logger.info(f"Buffered attendance for worker {worker_id}")
         return last_id
@@ -168,7 +343,7 @@ class SQLiteDatabase:
     def update_timeout(self, worker_id: int, attendance_date: str, 
                       time_out: str, hours_worked: float) -> bool:
         """Update time-out"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -180,30 +355,44 @@ class SQLiteDatabase:
         
         affected = cursor.rowcount
         conn.commit()
-        conn.close()
         
         return affected > 0
     
-    def get_pending_records(self) -> List[Dict[str, Any]]:
-        """Get pending sync records"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def get_pending_records(self, max_retries: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get pending sync records, skipping over-retried rows if asked"""
+        conn = self._connect()
         cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM attendance_buffer 
-            WHERE sync_status = 'pending'
-            ORDER BY created_at ASC
-        """)
-        
+
+        if max_retries is None:
+            cursor.execute("""
+                SELECT * FROM attendance_buffer
+                WHERE sync_status = 'pending'
+                ORDER BY created_at ASC
+            """)
+        else:
+            cursor.execute("""
+                SELECT * FROM attendance_buffer
+                WHERE sync_status = 'pending' AND retry_count < ?
+                ORDER BY created_at ASC
+            """, (max_retries,))
+
         records = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
+
         return records
-    
+
+    def increment_retry(self, buffer_id: int) -> None:
+        """Bump a record's sync retry counter"""
+        conn = self._connect()
+        conn.execute("""
+            UPDATE attendance_buffer
+            SET retry_count = retry_count + 1
+            WHERE id = ?
+        """, (buffer_id,))
+        conn.commit()
+
     def mark_synced(self, buffer_id: int) -> None:
         """Mark as synced"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -213,11 +402,10 @@ class SQLiteDatabase:
         """, (buffer_id,))
         
         conn.commit()
-        conn.close()
     
     def cache_face_encodings(self, encodings: List[Dict[str, Any]]) -> None:
         """Cache face encodings"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("DELETE FROM face_encodings_cache")
@@ -239,13 +427,11 @@ class SQLiteDatabase:
             ))
         
         conn.commit()
-        conn.close()
         logger.info(f"Cached {len(encodings)} encodings")
     
     def get_cached_encodings(self) -> List[Dict[str, Any]]:
         """Get cached encodings"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -254,6 +440,5 @@ class SQLiteDatabase:
         """)
         
         encodings = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         
         return encodings
\ No newline at end of file
@@ -18,11 +18,19 @@ class Config:
     
     # SQLite Database (Local Buffer)
     SQLITE_PATH: str = 'data/local.db'
+
+    # Binary cache of parsed face encodings (fast offline restarts); loaded
+    # memory-mapped, with worker metadata in a JSON sidecar next to it
+    ENCODINGS_CACHE_PATH: str = 'data/encodings.npy'
     
     # Face Recognition Settings
     FACE_RECOGNITION_TOLERANCE: float = 0.5  # Lower = stricter (0.6 default)
-    FACE_DETECTION_MODEL: str = 'hog'  # 'hog' for CPU, 'cnn' for GPU
+    FACE_DETECTION_MODEL: str = 'hog'  # 'hog' CPU, 'cnn' GPU, 'yunet' OpenCV DNN, 'mediapipe' BlazeFace
+    YUNET_MODEL_PATH: str = 'data/face_detection_yunet_2023mar.onnx'
+    ENCODING_BATCH_SIZE: int = 16  # Face chips per batched dlib descriptor call
     MIN_FACE_SIZE: Tuple[int, int] = (50, 50)  # Minimum face dimensions
+    DETECTION_DOWNSCALE: float = 0.35  # Detect on a scaled frame, encode full-res
+    MOTION_THRESHOLD: int = 500  # 40x30 grayscale absdiff sum that counts as motion
     
     # Attendance Logic
     DUPLICATE_TIMEOUT_SECONDS: int = 30  # Prevent duplicate scans
@@ -43,6 +51,11 @@ class Config:
     # Display
     DISPLAY_FEEDBACK_SECONDS: int = 3
     DISPLAY_FONT_SCALE: float = 1.5
+
+    # Remote display stream (hardware H.264 via GStreamer V4L2 M2M)
+    STREAM_ENABLED: bool = os.getenv('STREAM_ENABLED', '0') == '1'
+    STREAM_HOST: str = os.getenv('STREAM_HOST', '127.0.0.1')
+    STREAM_PORT: int = int(os.getenv('STREAM_PORT', '5000'))
     
     # Logging
     LOG_LEVEL: str = 'INFO'
@@ -1,9 +1,20 @@
+import os
+
+# Cap BLAS/OpenMP threads before numpy/cv2 load them - the Pi has 4 cores
+# and oversubscription causes context-switch storms
+os.environ.setdefault('OMP_NUM_THREADS', '2')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '2')
+
+import atexit
 import logging
+import queue
 import threading
 import time
 import sys
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 from config.settings import Config
@@ -14,18 +25,37 @@ from models.sync_manager import SyncManager
 from utils.camera import Camera
 from utils.gpio_handler import GPIOHandler
 from utils.display import Display
+from utils.streamer import VideoStreamer
+
+# Setup logging with UTF-8 encoding. Handlers sit behind an in-memory queue
+# so a slow SD-card write/fsync never stalls the frame loop - logger calls
+# just enqueue and a listener thread does the actual I/O.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+_file_handler = logging.FileHandler(Config.LOG_FILE, encoding='utf-8')
+_file_handler.setFormatter(_log_formatter)
+
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
 
-# Setup logging with UTF-8 encoding
+_log_queue: "queue.Queue" = queue.Queue(-1)
 logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(Config.LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+
+_log_listener = QueueListener(_log_queue, _file_handler, _stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
+# Keep OpenCV's own pool out of the way of dlib and the BLAS threads.
+# setNumThreads is process-global, so this is set once here and nowhere
+# else - a per-thread call would silently retune every other thread.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(1)
+
 
 class AttendanceSystem:
     """Main attendance system - optimized for performance"""
@@ -46,25 +76,55 @@ class AttendanceSystem:
         self.camera: Optional[Camera] = None
         self.gpio: Optional[GPIOHandler] = None
         self.display: Optional[Display] = None
+        self.streamer: Optional[VideoStreamer] = None
 
         # System state
         self.is_running = False
+        self._stop_event = threading.Event()
         self.timeout_mode = False
-        self.last_recognition_time: Optional[datetime] = None
+        # Monotonic debounce timestamp - wall clock jumps (NTP/DST) must
+        # not be able to defeat or extend the recognition cooldown
+        self._last_recog_mono: float = 0.0
 
         # Performance optimization
         self.target_fps = 30
         self.frame_time = 1.0 / self.target_fps
         self.skip_frames = 1  # Process EVERY frame for smooth tracking
-        self.frame_counter = 0
+        self._skip_countdown = 1  # Frames until the next recognition handoff
+
+        # Adaptive frame drop: back off when the recognition worker is still
+        # busy at handoff time, speed back up when it keeps pace
+        self._handoff_misses = 0
+        self._skip_window_start = 0.0
+
+        # Motion gate: recognition only runs when a thumbnail frame diff
+        # sees change, with a frame ceiling so tracking still refreshes
+        self._prev_motion_gray: Optional[np.ndarray] = None
+        self._frames_since_recog = 0
 
         # Threading
+        # Attendance DB work runs on a small bounded pool so a stalled
+        # MySQL round-trip can't freeze the frame loop mid-confirmation
+        self._attendance_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='attlog')
         self.sync_thread: Optional[threading.Thread] = None
+        self.recognition_thread: Optional[threading.Thread] = None
+        self.display_thread: Optional[threading.Thread] = None
+
+        # Display writer handoff - bounded frame queue paces the main loop,
+        # key events are forwarded back from the GUI thread
+        self.display_queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=1)
+        self.key_queue: "queue.Queue[int]" = queue.Queue()
 
-        # Success display overlay (non-blocking)
-        self.success_overlay: Optional[Dict[str, Any]] = None
-        self.overlay_lock = threading.Lock()
-        self.overlay_end_time: Optional[float] = None
+        # Recognition handoff - shared preallocated frame + event, results
+        # come back through a single-slot queue (latest result wins)
+        self._recog_frame: Optional[np.ndarray] = None
+        self._recog_busy = threading.Event()
+        self.result_queue: "queue.Queue[Tuple[Dict[str, Any], Tuple[int, int, int, int]]]" = queue.Queue(maxsize=1)
+
+        # Success display overlay (non-blocking). Data and expiry live in
+        # one tuple so a single atomic assignment publishes both - the
+        # display thread reads a consistent snapshot without a lock
+        self.success_overlay: Optional[Tuple[Dict[str, Any], float]] = None
 
         # Confirmation system
         self.pending_worker: Optional[Dict[str, Any]] = None
@@ -77,6 +137,15 @@ class AttendanceSystem:
         # Lightweight UI params
         self.font = cv2.FONT_HERSHEY_SIMPLEX
 
+        # Display FPS as an exponential moving average - one multiply-add
+        # per frame, no sample list to allocate or sum
+        self._fps_ema = float(self.target_fps)
+
+        # Status bar cache - (epoch second, online, timeout_mode, text);
+        # the formatted date is cached separately since it changes daily
+        self._status_cache: Tuple[int, bool, bool, str] = (-1, False, False, '')
+        self._date_cache: Tuple[int, str] = (-1, '')
+
     def initialize(self) -> bool:
         """Initialize all system components"""
         logger.info("Initializing components...")
@@ -133,6 +202,17 @@ class AttendanceSystem:
             self.display.create_window(fullscreen=False)
             logger.info("Display initialized (windowed)")
 
+            # Optional remote stream
+            if Config.STREAM_ENABLED:
+                logger.info("Initializing video stream...")
+                self.streamer = VideoStreamer(
+                    Config.STREAM_HOST, Config.STREAM_PORT,
+                    resolution=Config.CAMERA_RESOLUTION,
+                    fps=Config.CAMERA_FRAMERATE
+                )
+                if not self.streamer.initialize():
+                    self.streamer = None
+
             # Load face encodings
             logger.info("Loading face encodings...")
             encoding_count = 0
@@ -164,20 +244,48 @@ class AttendanceSystem:
         self.sync_thread = threading.Thread(target=self._sync_worker, daemon=True)
         self.sync_thread.start()
 
+        # Triple-buffered capture: one buffer being written, one queued for
+        # display, one being drawn by the display worker - no copies needed.
+        # The write index only advances on a successful handoff (below), so
+        # at most two buffers are ever in flight and a dropped frame reuses
+        # its own buffer instead of lapping one still queued or on screen.
+        width, height = Config.CAMERA_RESOLUTION
+        capture_bufs = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(3)]
+        buf_idx = 0
+
+        # Start recognition worker (dlib releases the GIL, so this runs in
+        # parallel with the display loop)
+        self._recog_frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.recognition_thread = threading.Thread(target=self._recognition_worker, daemon=True)
+        self.recognition_thread.start()
+
+        # Start display writer
+        self.display_thread = threading.Thread(target=self._display_worker, daemon=True)
+        self.display_thread.start()
+
+        # Hoist hot-path lookups into locals - attribute/dict lookups at
+        # 30 Hz add up, locals are a single C-level array read
+        read_new_into = self.camera.read_new_into
+        recog_busy = self._recog_busy
+        recog_frame = self._recog_frame
+        result_get = self.result_queue.get_nowait
+        display_put = self.display_queue.put
+        key_get = self.key_queue.get_nowait
+        draw_cached = self.face_recognizer.draw_cached_faces
+        monotonic = time.monotonic
+        motion_threshold = Config.MOTION_THRESHOLD
+
         try:
             while self.is_running:
-                loop_start = time.time()
+                frame = capture_bufs[buf_idx]
 
-                # Read frame
-                ret, frame = self.camera.read_frame()
-                if not ret or frame is None:
-                    logger.error("Failed to read camera frame")
-                    time.sleep(0.1)
+                # Block until the grabber delivers a NEW frame (drop-oldest:
+                # the camera thread only ever keeps the latest one)
+                if not read_new_into(frame, timeout=0.1):
                     continue
 
-                # Mirror for natural preview
-                frame = cv2.flip(frame, 1)
-                self.frame_counter += 1
+                # Mirror for natural preview (in place)
+                cv2.flip(frame, 1, dst=frame)
 
                 # Confirmation timeout reset
                 if self.waiting_for_confirmation and self.confirmation_start_time:
@@ -188,75 +296,82 @@ class AttendanceSystem:
                         self.confirmation_start_time = None
                         self.last_recognized_worker_id = None
 
-                # Recognition (every N frames) - ALWAYS runs, never stops
-                if self.frame_counter % self.skip_frames == 0:
-                    try:
-                        worker_info, frame, face_box = self.face_recognizer.recognize_face(frame)
-                    except Exception:
-                        out = self.face_recognizer.recognize_face(frame)
-                        if isinstance(out, tuple) and len(out) >= 2:
-                            worker_info = out[0]
-                            frame = out[1]
-                            face_box = None
+                # Motion gate: a 40x30 grayscale diff is ~microseconds and
+                # tells us whether the scene changed at all since last frame
+                thumb = cv2.resize(frame, (40, 30), interpolation=cv2.INTER_AREA)
+                thumb_gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+                if self._prev_motion_gray is None:
+                    motion = True
+                else:
+                    motion = int(cv2.absdiff(thumb_gray, self._prev_motion_gray).sum()) > motion_threshold
+                self._prev_motion_gray = thumb_gray
+
+                # Hand the freshest frame to the recognition worker (every N
+                # frames, skipped while the worker is still busy). Still
+                # frames are skipped too, with a ceiling so cached tracking
+                # is re-verified at least every 15 frames.
+                self._frames_since_recog += 1
+                self._skip_countdown -= 1
+                if self._skip_countdown <= 0:
+                    self._skip_countdown = self.skip_frames
+                    if motion or self._frames_since_recog >= 15:
+                        if recog_busy.is_set():
+                            self._handoff_misses += 1
                         else:
-                            worker_info = None
-                            face_box = None
+                            np.copyto(recog_frame, frame)
+                            recog_busy.set()
+                            self._frames_since_recog = 0
+
+                # Re-tune the skip interval once per second: misses mean the
+                # worker is falling behind, a clean second earns speed back
+                now_mono = monotonic()
+                if now_mono - self._skip_window_start >= 1.0:
+                    if self._handoff_misses == 0:
+                        self.skip_frames = max(1, self.skip_frames - 1)
+                    else:
+                        self.skip_frames = min(6, 1 + self._handoff_misses // 5)
+                    self._handoff_misses = 0
+                    self._skip_window_start = now_mono
+
+                # Read at most one recognition result per tick
+                try:
+                    recog_result = result_get()
+                except queue.Empty:
+                    recog_result = None
+
+                if recog_result and not self.waiting_for_confirmation:
+                    worker_info, face_box = recog_result
+                    self._handle_recognition(worker_info, face_box)
 
-                    # Handle recognition for confirmation
-                    if worker_info and face_box and not self.waiting_for_confirmation:
-                        self._handle_recognition(worker_info, face_box)
+                # Overlay the latest tracked faces on the display frame
+                draw_cached(frame)
 
                 # Show confirmation text (no rectangle box, just overlay text)
                 if self.waiting_for_confirmation and self.pending_worker:
                     frame = self._draw_confirmation_text(frame, self.pending_worker)
 
-                # Optimized status bar (removed FPS)
-                status = self._get_status_text()
-                frame = self.display.add_status_bar(frame, status)
-
-                # Mode indicator
-                if self.timeout_mode:
-                    frame = self.display.add_overlay(
-                        frame,
-                        "TIME-OUT MODE",
-                        position=(8, 36),
-                        color=(0, 165, 255),
-                        font_scale=0.7
-                    )
-
-                # Draw success banner
-                with self.overlay_lock:
-                    if self.success_overlay is not None:
-                        if time.time() < (self.overlay_end_time or 0):
-                            frame = self._draw_success_banner(frame, self.success_overlay)
-                        else:
-                            self.success_overlay = None
-                            self.overlay_end_time = None
-
-                # Display frame
-                self.display.show_frame(frame)
+                # Hand the frame to the display writer; the bounded queue
+                # paces this loop to the display rate. Only a successful put
+                # advances the buffer ring - a dropped frame's buffer is
+                # ours again next iteration, never one still in flight
+                try:
+                    display_put(frame, timeout=0.5)
+                    buf_idx = (buf_idx + 1) % len(capture_bufs)
+                except queue.Full:
+                    pass  # Display stalled - drop this frame, reuse its buffer
+
+                # Handle key events forwarded by the display thread
+                quit_requested = False
+                while True:
+                    try:
+                        key = key_get()
+                    except queue.Empty:
+                        break
+                    if not self._handle_key(key):
+                        quit_requested = True
 
-                # Handle keyboard
-                key = self.display.wait_key(1)
-                if key == ord('q') or key == 27:
-                    logger.info("Quit key pressed")
+                if quit_requested:
                     break
-                elif key == ord('t'):
-                    self._toggle_timeout_mode()
-                elif key == ord('r'):
-                    self._reload_encodings()
-                elif key == ord('c') or key == ord('C'):
-                    if self.waiting_for_confirmation and self.pending_worker:
-                        self._confirm_attendance()
-                elif key == ord('x') or key == ord('X'):
-                    if self.waiting_for_confirmation:
-                        self._cancel_confirmation()
-
-                # FPS limiter
-                next_frame = loop_start + self.frame_time
-                sleep_time = next_frame - time.time()
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
 
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
@@ -265,22 +380,130 @@ class AttendanceSystem:
         finally:
             self.shutdown()
 
+    def _display_worker(self):
+        """Display writer thread - owns all drawing, imshow and waitKey"""
+        logger.info("Display worker started")
+
+        frame_time = self.frame_time
+        frame_get = self.display_queue.get
+        last_shown = time.time()
+        next_fps_log = last_shown + 30.0
+
+        while self.is_running:
+            loop_start = time.time()
+
+            try:
+                frame = frame_get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Running FPS estimate, logged occasionally for diagnostics
+            now = time.time()
+            instant_fps = 1.0 / max(1e-6, now - last_shown)
+            last_shown = now
+            self._fps_ema = 0.9 * self._fps_ema + 0.1 * instant_fps
+            if now >= next_fps_log:
+                logger.debug(f"Display FPS (EMA): {self._fps_ema:.1f}")
+                next_fps_log = now + 30.0
+
+            # Optimized status bar (removed FPS)
+            status = self._get_status_text()
+            frame = self.display.add_status_bar(frame, status)
+
+            # Mode indicator (pre-rendered sprite)
+            if self.timeout_mode:
+                frame = self.display.blit_text(
+                    frame,
+                    "TIME-OUT MODE",
+                    position=(8, 36),
+                    color=(0, 165, 255),
+                    font_scale=0.7
+                )
+
+            # Draw success banner (atomic snapshot, no lock)
+            banner = self.success_overlay
+            if banner is not None:
+                overlay_data, end_time = banner
+                if time.time() < end_time:
+                    frame = self._draw_success_banner(frame, overlay_data)
+                else:
+                    self.success_overlay = None
+
+            # Display frame
+            self.display.show_frame(frame)
+
+            # Mirror the annotated frame to the remote stream (hardware encode)
+            if self.streamer is not None:
+                self.streamer.write(frame)
+
+            # waitKey doubles as the FPS limiter; key events go back to the
+            # main loop (cv2 wants the GUI pump on a single thread)
+            elapsed = time.time() - loop_start
+            remaining_ms = max(1, int((frame_time - elapsed) * 1000))
+            key = self.display.wait_key(remaining_ms)
+            if key != 255:
+                self.key_queue.put(key)
+
+        logger.info("Display worker stopped")
+
+    def _handle_key(self, key: int) -> bool:
+        """Handle a forwarded key event; returns False when quit is requested"""
+        if key == ord('q') or key == 27:
+            logger.info("Quit key pressed")
+            return False
+        elif key == ord('t'):
+            self._toggle_timeout_mode()
+        elif key == ord('r'):
+            self._reload_encodings()
+        elif key == ord('c') or key == ord('C'):
+            if self.waiting_for_confirmation and self.pending_worker:
+                self._confirm_attendance()
+        elif key == ord('x') or key == ord('X'):
+            if self.waiting_for_confirmation:
+                self._cancel_confirmation()
+        return True
+
+    def _recognition_worker(self):
+        """Background recognition worker - reads the shared frame buffer"""
+        logger.info("Recognition worker started")
+
+        while self.is_running:
+            if not self._recog_busy.wait(timeout=0.5):
+                continue
+            if not self.is_running:
+                break
+
+            try:
+                worker_info, _, face_box = self.face_recognizer.recognize_face(self._recog_frame)
+                if worker_info and face_box:
+                    # Slot pattern: drop the stale result, keep the latest
+                    try:
+                        self.result_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self.result_queue.put_nowait((worker_info, face_box))
+            except Exception as e:
+                logger.error(f"Recognition error: {e}")
+            finally:
+                self._recog_busy.clear()
+
+        logger.info("Recognition worker stopped")
+
     def _handle_recognition(self, worker_info: Dict[str, Any], face_box: Tuple[int, int, int, int]):
         """Store recognized worker and wait for confirmation"""
-        now = datetime.now()
+        mono = time.monotonic()
         worker_id = worker_info.get('worker_id')
 
-        # Cooldown check
+        # Cooldown check (monotonic - immune to wall-clock jumps)
         if self.last_recognized_worker_id == worker_id:
-            if self.last_recognition_time:
-                time_diff = (now - self.last_recognition_time).total_seconds()
-                if time_diff < self.recognition_cooldown:
-                    return
-        
-        self.last_recognition_time = now
+            if mono - self._last_recog_mono < self.recognition_cooldown:
+                return
+
+        self._last_recog_mono = mono
         self.last_recognized_worker_id = worker_id
         
-        self.pending_worker = worker_info.copy()
+        # The recognition worker hands over a fresh dict - no defensive copy
+        self.pending_worker = worker_info
         self.waiting_for_confirmation = True
         self.confirmation_start_time = time.time()
 
@@ -297,17 +520,30 @@ class AttendanceSystem:
         worker_id = self.pending_worker.get('worker_id', 0)
         worker_code = self.pending_worker.get('worker_code', 'N/A')
 
-        # Process attendance
-        result = self._process_attendance(self.pending_worker)
+        # One timestamp for the whole confirmation (attendance + overlay)
+        now = datetime.now()
 
-        # Show result overlay
-        self._show_result_overlay(result, worker_name, worker_id, worker_code)
+        # Process attendance off the frame loop; the overlay is published
+        # by the worker when the DB round-trip finishes
+        self._attendance_pool.submit(
+            self._finish_confirmation,
+            self.pending_worker, worker_name, worker_id, worker_code, now
+        )
 
         # Reset confirmation state
         self.pending_worker = None
         self.waiting_for_confirmation = False
         self.confirmation_start_time = None
 
+    def _finish_confirmation(self, worker: Dict[str, Any], worker_name: str,
+                             worker_id: int, worker_code: str, now: datetime):
+        """Pool worker: run the attendance write and show the result"""
+        try:
+            result = self._process_attendance(worker)
+            self._show_result_overlay(result, worker_name, worker_id, worker_code, now)
+        except Exception as e:
+            logger.error(f"Attendance processing failed: {e}")
+
     def _cancel_confirmation(self):
         """User pressed 'X' - cancel confirmation"""
         logger.info("User cancelled confirmation")
@@ -347,14 +583,13 @@ class AttendanceSystem:
         cv2.putText(frame, text2, (x2 + 2, y2 + 2), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)
         cv2.putText(frame, text2, (x2, y2), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (220, 220, 220), 2)
         
-        # Line 3: Instructions
+        # Line 3: Instructions (static - blit the cached sprite)
         text3 = "Press C to CONFIRM | Press X to CANCEL"
         (text_w3, text_h3), _ = cv2.getTextSize(text3, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
         x3 = center_x - text_w3 // 2
         y3 = 160
-        
-        cv2.putText(frame, text3, (x3 + 2, y3 + 2), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 3)
-        cv2.putText(frame, text3, (x3, y3), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+        self.display.blit_text(frame, text3, (x3, y3), color=(255, 255, 0), font_scale=0.7)
 
         return frame
 
@@ -409,10 +644,11 @@ class AttendanceSystem:
 
         return result
 
-    def _show_result_overlay(self, result: Dict[str, Any], worker_name: str, 
-                            worker_id: int, worker_code: str):
+    def _show_result_overlay(self, result: Dict[str, Any], worker_name: str,
+                            worker_id: int, worker_code: str,
+                            timestamp: Optional[datetime] = None):
         """Set success overlay data"""
-        current_time = datetime.now()
+        current_time = timestamp or datetime.now()
 
         overlay_data = {
             'worker_name': worker_name,
@@ -422,9 +658,7 @@ class AttendanceSystem:
             'timestamp': current_time
         }
 
-        with self.overlay_lock:
-            self.success_overlay = overlay_data
-            self.overlay_end_time = time.time() + 2.5
+        self.success_overlay = (overlay_data, time.time() + Config.DISPLAY_FEEDBACK_SECONDS)
 
     def _toggle_timeout_mode(self):
         """Toggle time-out mode"""
@@ -451,34 +685,55 @@ class AttendanceSystem:
             logger.warning(f"Reload failed: {e}")
 
     def _get_status_text(self) -> str:
-        """Get optimized status text - removed FPS, added time and full date"""
+        """Get optimized status text - recomputed only once per second"""
+        online = bool(self.mysql_db and getattr(self.mysql_db, 'is_connected', False))
+        second = int(time.time())
+
+        cached_sec, cached_online, cached_mode, cached_text = self._status_cache
+        if second == cached_sec and online == cached_online and self.timeout_mode == cached_mode:
+            return cached_text
+
         parts = []
-        
+
         # Online/Offline status
-        parts.append("[ONLINE]" if (self.mysql_db and getattr(self.mysql_db, 'is_connected', False)) else "[OFFLINE]")
-        
+        parts.append("[ONLINE]" if online else "[OFFLINE]")
+
         # Mode (Full text instead of abbreviation)
         parts.append("TIME OUT" if self.timeout_mode else "TIME IN")
-        
+
         # Current time in 12-hour format
         now = datetime.now()
         parts.append(now.strftime('%I:%M:%S %p'))
-        
-        # Full date format (e.g., "November 30, 2025")
-        parts.append(now.strftime('%B %d, %Y'))
 
-        return " | ".join(parts)
+        # Full date format (e.g., "November 30, 2025") - reformatted daily
+        day = now.toordinal()
+        if day != self._date_cache[0]:
+            self._date_cache = (day, now.strftime('%B %d, %Y'))
+        parts.append(self._date_cache[1])
+
+        text = " | ".join(parts)
+        self._status_cache = (second, online, self.timeout_mode, text)
+        return text
 
     def _sync_worker(self):
         """Background sync worker"""
         logger.info("Sync worker started")
 
+        sync_interval = Config.SYNC_INTERVAL_SECONDS
+
         while self.is_running:
-            time.sleep(Config.SYNC_INTERVAL_SECONDS)
+            # Interruptible sleep - shutdown no longer waits out the interval
+            if self._stop_event.wait(sync_interval):
+                break
 
             try:
-                if self.mysql_db and not getattr(self.mysql_db, 'is_connected', False):
-                    if self.mysql_db.connect():
+                if self.mysql_db:
+                    # Ping distinguishes dead connections from idle ones;
+                    # reconnects back off exponentially on a flaky network
+                    if self.mysql_db.is_connected:
+                        self.mysql_db.ping()
+
+                    if not self.mysql_db.is_connected and self.mysql_db.try_reconnect():
                         logger.info("MySQL reconnected")
                         try:
                             self.face_recognizer.load_encodings()
@@ -499,10 +754,20 @@ class AttendanceSystem:
         logger.info("Shutting down...")
 
         self.is_running = False
+        self._stop_event.set()
+
+        if self.recognition_thread:
+            self._recog_busy.set()  # Wake the worker so it can exit
+            self.recognition_thread.join(timeout=3)
+
+        if self.display_thread:
+            self.display_thread.join(timeout=3)
 
         if self.sync_thread:
             self.sync_thread.join(timeout=3)
 
+        self._attendance_pool.shutdown(wait=False)
+
         if self.camera:
             try:
                 self.camera.release()
@@ -515,6 +780,12 @@ class AttendanceSystem:
             except Exception:
                 pass
 
+        if self.streamer:
+            try:
+                self.streamer.release()
+            except Exception:
+                pass
+
         if self.display:
             try:
                 self.display.destroy()
@@ -1,19 +1,118 @@
 import logging
+import queue
+import threading
+import time
 from datetime import datetime, date, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from config.settings import Config
 from config.database import MySQLDatabase, SQLiteDatabase
 
 logger = logging.getLogger(__name__)
 
+# Hot-path statements, run through prepared cursors so MySQL parses and
+# plans each of them exactly once per connection
+_Q_DAY_STATE = """
+    SELECT attendance_id, time_in, time_out FROM attendance
+    WHERE worker_id = %s AND attendance_date = %s
+    AND is_archived = 0
+"""
+
+_Q_TIMEIN_INSERT = """
+    INSERT INTO attendance
+    (worker_id, attendance_date, time_in, status)
+    VALUES (%s, %s, %s, 'present')
+"""
+
+_Q_TIMEOUT_FIND = """
+    SELECT attendance_id, time_in FROM attendance
+    WHERE worker_id = %s AND attendance_date = %s
+    AND time_out IS NULL AND is_archived = 0
+"""
+
+_Q_TIMEOUT_UPDATE = """
+    UPDATE attendance
+    SET time_out = %s, hours_worked = %s, updated_at = NOW()
+    WHERE attendance_id = %s
+"""
+
 
 class AttendanceLogger:
     """Manages attendance time-in/time-out logic"""
-    
+
     def __init__(self, mysql_db: MySQLDatabase, sqlite_db: SQLiteDatabase):
         self.mysql_db = mysql_db
         self.sqlite_db = sqlite_db
-        self.last_scan_cache: Dict[str, datetime] = {}  # Prevent duplicate scans
+        # Prevent duplicate scans - monotonic stamps, immune to clock jumps
+        self.last_scan_cache: Dict[str, float] = {}
+
+        # Per-worker day state so repeat scans skip the MySQL SELECT:
+        # worker_id -> ('timed_in'|'completed', attendance_id, time_in)
+        self._state_cache: Dict[int, Tuple[str, Optional[int], Any]] = {}
+        self._state_date: date = date.today()
+        self._prefetch_today()
+
+        # Stored procedures fold the attendance + activity_logs writes into
+        # one round-trip; disabled after the first failure (not deployed)
+        self._procs_available = True
+
+        # Activity logs are best-effort, so they go through a background
+        # writer instead of costing the UI path a second network round-trip
+        self._activity_q: "queue.Queue[Tuple]" = queue.Queue()
+        self._activity_thread = threading.Thread(target=self._activity_writer, daemon=True)
+        self._activity_thread.start()
+
+    def _prefetch_today(self) -> None:
+        """Warm the day-state cache with today's rows in one query"""
+        if not (self.mysql_db and self.mysql_db.is_connected):
+            return
+
+        try:
+            rows = self.mysql_db.fetch_all("""
+                SELECT worker_id, attendance_id, time_in, time_out
+                FROM attendance
+                WHERE attendance_date = CURDATE() AND is_archived = 0
+            """)
+        except Exception as e:
+            logger.warning(f"Day-state prefetch failed: {e}")
+            return
+
+        for row in rows:
+            status = 'completed' if row['time_out'] is not None else 'timed_in'
+            self._state_cache[row['worker_id']] = (status, row['attendance_id'], row['time_in'])
+
+        if rows:
+            logger.info(f"Prefetched day state for {len(rows)} workers")
+
+    def _rollover_check(self) -> None:
+        """Drop the day-state cache when the date changes"""
+        today = date.today()
+        if today != self._state_date:
+            self._state_cache.clear()
+            self._state_date = today
+
+    def _log_activity(self, action: str, record_id: Optional[int], description: str) -> None:
+        """Queue an activity log row for the background writer"""
+        self._activity_q.put((action, 'attendance', record_id, description, 'raspberry_pi'))
+
+    def _activity_writer(self) -> None:
+        """Drain queued activity logs into MySQL in executemany batches"""
+        while True:
+            rows = [self._activity_q.get()]
+            try:
+                while len(rows) < 32:
+                    rows.append(self._activity_q.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                if self.mysql_db and self.mysql_db.is_connected:
+                    self.mysql_db.execute_many("""
+                        INSERT INTO activity_logs
+                        (action, table_name, record_id, description, ip_address)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """, rows)
+            except Exception as e:
+                logger.warning(f"Activity log failed: {e}")
     
     def log_timein(self, worker_id: int) -> Dict[str, Any]:
         """
@@ -29,34 +128,43 @@ class AttendanceLogger:
         """
         today = date.today().isoformat()
         now = datetime.now()
-        
+        mono = time.monotonic()
+
         # Check duplicate scan cache
         cache_key = f"{worker_id}_{today}"
         if cache_key in self.last_scan_cache:
             last_scan = self.last_scan_cache[cache_key]
-            if (now - last_scan).seconds < Config.DUPLICATE_TIMEOUT_SECONDS:
+            if mono - last_scan < Config.DUPLICATE_TIMEOUT_SECONDS:
                 return {
                     'success': False,
                     'action': 'duplicate',
                     'message': 'Already scanned recently'
                 }
         
-        # Check if time-in exists today
+        # Check if time-in exists today - the day-state cache answers repeat
+        # scans without a network round-trip, MySQL only on a cache miss
+        self._rollover_check()
         if self.mysql_db.is_connected:
-            existing = self.mysql_db.fetch_one("""
-                SELECT attendance_id, time_out FROM attendance
-                WHERE worker_id = %s AND attendance_date = %s
-                AND is_archived = 0
-            """, (worker_id, today))
-            
-            if existing:
-                if existing['time_out'] is None:
+            state = self._state_cache.get(worker_id)
+
+            if state is None:
+                existing = self.mysql_db.fetch_one_prepared(
+                    'day_state', _Q_DAY_STATE, (worker_id, today)
+                )
+
+                if existing:
+                    status = 'completed' if existing['time_out'] is not None else 'timed_in'
+                    state = (status, existing['attendance_id'], existing['time_in'])
+                    self._state_cache[worker_id] = state
+
+            if state is not None:
+                if state[0] == 'timed_in':
                     # Already timed-in, offer time-out
                     return {
                         'success': False,
                         'action': 'already_in',
                         'message': 'Already timed in. Ready for time-out?',
-                        'attendance_id': existing['attendance_id']
+                        'attendance_id': state[1]
                     }
                 else:
                     # Already completed
@@ -70,24 +178,27 @@ class AttendanceLogger:
         time_in = now.strftime('%H:%M:%S')
         
         if self.mysql_db.is_connected:
-            # Direct to MySQL
-            query = """
-                INSERT INTO attendance 
-                (worker_id, attendance_date, time_in, status)
-                VALUES (%s, %s, %s, 'present')
-            """
-            attendance_id = self.mysql_db.execute_query(query, (worker_id, today, time_in))
-            
+            # Direct to MySQL - stored proc does both writes in one
+            # round-trip, plain INSERT + async activity log as fallback
+            attendance_id = None
+            if self._procs_available:
+                result = self.mysql_db.call_proc('sp_log_timein', (worker_id, today, time_in, 0))
+                if result:
+                    attendance_id = result[3] or None
+                else:
+                    self._procs_available = False
+
+            if attendance_id is None:
+                attendance_id = self.mysql_db.execute_prepared(
+                    'timein_insert', _Q_TIMEIN_INSERT, (worker_id, today, time_in)
+                )
+
+                if attendance_id:
+                    # Log activity in the background (best-effort)
+                    self._log_activity('clock_in', attendance_id, 'Facial recognition time-in')
+
             if attendance_id:
-                # Log activity (skip if fails)
-                try:
-                    self.mysql_db.execute_query("""
-                        INSERT INTO activity_logs 
-                        (action, table_name, record_id, description, ip_address)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, ('clock_in', 'attendance', attendance_id, 'Facial recognition time-in', 'raspberry_pi'))
-                except Exception as e:
-                    logger.warning(f"Activity log failed: {e}")
+                self._state_cache[worker_id] = ('timed_in', attendance_id, time_in)
         else:
             # Buffer to SQLite
             attendance_id = self.sqlite_db.insert_attendance(
@@ -95,7 +206,7 @@ class AttendanceLogger:
             )
         
         # Update cache
-        self.last_scan_cache[cache_key] = now
+        self.last_scan_cache[cache_key] = mono
         
         return {
             'success': True,
@@ -121,14 +232,25 @@ class AttendanceLogger:
         now = datetime.now()
         time_out = now.strftime('%H:%M:%S')
         
-        # Find today's time-in
+        # Find today's time-in (cached day state first, MySQL on a miss)
+        self._rollover_check()
         if self.mysql_db.is_connected:
-            record = self.mysql_db.fetch_one("""
-                SELECT attendance_id, time_in FROM attendance
-                WHERE worker_id = %s AND attendance_date = %s
-                AND time_out IS NULL AND is_archived = 0
-            """, (worker_id, today))
-            
+            state = self._state_cache.get(worker_id)
+
+            if state is not None and state[0] == 'completed':
+                return {
+                    'success': False,
+                    'action': 'no_timein',
+                    'message': 'No time-in found for today'
+                }
+
+            if state is not None:
+                record = {'attendance_id': state[1], 'time_in': state[2]}
+            else:
+                record = self.mysql_db.fetch_one_prepared(
+                    'timeout_find', _Q_TIMEOUT_FIND, (worker_id, today)
+                )
+
             if not record:
                 return {
                     'success': False,
@@ -156,22 +278,27 @@ class AttendanceLogger:
                 logger.error(f"Error calculating hours: {e}")
                 hours_worked = 0.0
             
-            # Update time-out
-            self.mysql_db.execute_query("""
-                UPDATE attendance 
-                SET time_out = %s, hours_worked = %s, updated_at = NOW()
-                WHERE attendance_id = %s
-            """, (time_out, hours_worked, record['attendance_id']))
-            
-            # Log activity (skip if fails)
-            try:
-                self.mysql_db.execute_query("""
-                    INSERT INTO activity_logs 
-                    (action, table_name, record_id, description, ip_address)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, ('clock_out', 'attendance', record['attendance_id'], 'Facial recognition time-out', 'raspberry_pi'))
-            except Exception as e:
-                logger.warning(f"Activity log failed: {e}")
+            # Update time-out (stored proc covers the activity log too)
+            used_proc = False
+            if self._procs_available:
+                result = self.mysql_db.call_proc(
+                    'sp_log_timeout', (record['attendance_id'], time_out, hours_worked)
+                )
+                if result:
+                    used_proc = True
+                else:
+                    self._procs_available = False
+
+            if not used_proc:
+                self.mysql_db.execute_prepared(
+                    'timeout_update', _Q_TIMEOUT_UPDATE,
+                    (time_out, hours_worked, record['attendance_id'])
+                )
+
+                # Log activity in the background (best-effort)
+                self._log_activity('clock_out', record['attendance_id'], 'Facial recognition time-out')
+
+            self._state_cache[worker_id] = ('completed', record['attendance_id'], record['time_in'])
         else:
             # Buffer to SQLite
             hours_worked = 8.0  # Default estimate
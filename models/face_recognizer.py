@@ -1,8 +1,29 @@
+import base64
+import os
 import face_recognition
 import numpy as np
+
+try:
+    # Batched encoding path: dlib's descriptor net accepts a list of face
+    # chips and runs them as one batch, amortizing per-call overhead
+    import dlib
+    from face_recognition.api import face_encoder as _dlib_encoder
+    from face_recognition.api import pose_predictor_68_point as _pose_predictor
+except Exception:
+    dlib = None
+    _dlib_encoder = None
+    _pose_predictor = None
 import cv2
 import json
+import time
+
+try:
+    # 3-5x faster than stdlib json on the legacy float-array rows
+    import orjson
+except ImportError:
+    orjson = None
 import logging
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Dict, Any
 from config.settings import Config
 from config.database import MySQLDatabase, SQLiteDatabase
@@ -10,24 +31,185 @@ from config.database import MySQLDatabase, SQLiteDatabase
 logger = logging.getLogger(__name__)
 
 
+def _encode_training_image(jpg_bytes: bytes) -> Tuple[Optional[np.ndarray], int]:
+    """Process one training image, returns (chip or encoding, faces found)
+
+    Module-level so ProcessPoolExecutor can pickle it; takes JPEG bytes
+    because a compressed image crosses the process boundary far cheaper
+    than a raw frame. With the dlib bindings available the worker stops
+    at the aligned 150x150 face chip - the parent then runs every chip
+    through the descriptor net as ONE batch instead of per-image calls.
+    Without them it returns the finished encoding.
+    """
+    img = cv2.imdecode(np.frombuffer(jpg_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return None, 0
+
+    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    face_locations = face_recognition.face_locations(rgb_img)
+    if not face_locations:
+        return None, 0
+
+    if _dlib_encoder is not None:
+        top, right, bottom, left = face_locations[0]
+        shape = _pose_predictor(rgb_img, dlib.rectangle(left, top, right, bottom))
+        return dlib.get_face_chip(rgb_img, shape), len(face_locations)
+
+    face_encodings = face_recognition.face_encodings(rgb_img, face_locations)
+    if not face_encodings:
+        return None, len(face_locations)
+    return face_encodings[0], len(face_locations)
+
+
+try:
+    # Hand-written SIMD distance kernels with runtime CPU dispatch
+    # (AVX-512/AVX2 on x86, NEON/SVE on ARM) - no recompile needed
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _nb_match(known, probe):  # pragma: no cover - compiled
+        """Nearest row of `known` to `probe`, returns (index, squared dist)"""
+        best_i = 0
+        best_d2 = np.inf
+        for i in range(known.shape[0]):
+            d2 = 0.0
+            for j in range(probe.shape[0]):
+                diff = known[i, j] - probe[j]
+                d2 += diff * diff
+            if d2 < best_d2:
+                best_d2 = d2
+                best_i = i
+        return best_i, best_d2
+else:
+    _nb_match = None
+
+
 class FaceRecognizer:
     """Optimized face recognition - smooth 30 FPS"""
     
     def __init__(self, mysql_db: MySQLDatabase, sqlite_db: SQLiteDatabase):
         self.mysql_db = mysql_db
         self.sqlite_db = sqlite_db
-        self.known_encodings: List[np.ndarray] = []
         self.known_metadata: List[Dict[str, Any]] = []
         self.last_update: Optional[float] = None
-        
+
         # Performance settings - OPTIMIZED for smooth tracking
-        self.scale_factor = 0.35  # Further reduced for faster processing
-        self.tolerance = 0.5
+        # Detection runs on the downscaled frame; encoding reads the full-
+        # resolution frame so the chip quality doesn't suffer
+        self.scale_factor = getattr(Config, 'DETECTION_DOWNSCALE', 0.35)
+        # Resolved once here - per-face Config lookups in the 30 FPS loop
+        # are pure overhead. _tol2 lets squared-space compares skip sqrt.
+        self.tolerance = getattr(Config, 'FACE_RECOGNITION_TOLERANCE', 0.5)
+        self._tol2 = self.tolerance ** 2
+
+        # Structure-of-arrays encoding store: one contiguous (N, 128) float32
+        # matrix plus a parallel worker-id array. Metadata dicts are only
+        # touched after a match, never during the distance scan.
+        self._enc_matrix: Optional[np.ndarray] = None
+        self._enc_ids: Optional[np.ndarray] = None
+        self._enc_sqnorms: Optional[np.ndarray] = None
+        self._balltree = None
+
+        # int8 quantized copy of the matrix for the linear-scan path - 4x
+        # smaller and the widening int16 math maps onto NEON on the Pi.
+        # The int16 shadow avoids re-widening the whole matrix per probe.
+        self._enc_q: Optional[np.ndarray] = None
+        self._enc_q16: Optional[np.ndarray] = None
+        self._enc_scale = 1.0
+
+        # Scratch for the per-probe subtract (recognition thread only)
+        self._diff_buf: Optional[np.ndarray] = None
+
+        # Persistent image buffers for the per-frame resize and BGR->RGB
+        # conversion - sized on the first frame, reused ever after so the
+        # hot path stops allocating ~1.5MB of fresh arrays per detection
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+        self._gray_buf: Optional[np.ndarray] = None
         
         # Cache last face locations to maintain smooth tracking
         self.last_face_locations = []
         self.last_face_names = []
         self.last_face_ids = []  # Track worker IDs
+
+        # Centroid tracks: worker info per cached box, carried forward while
+        # a new detection lands close to a recently identified one. Tracks
+        # expire fast so the expensive encode still reruns periodically.
+        self._last_face_infos: List[Optional[Dict[str, Any]]] = []
+        self.track_timeout = 0.8  # seconds before a track must re-encode
+        self.track_iou = 0.7  # box overlap needed to carry an identity
+        self._track_deadline = 0.0
+
+        # Detection runs at a fixed interval; cached boxes are drawn between
+        # detections so display FPS is decoupled from recognition FPS
+        self.detection_interval = 0.15  # seconds
+        self._last_detection_time = 0.0
+
+        # Optional YuNet DNN detector - ~10-15ms on a Pi4 vs ~80ms for HOG
+        self.detection_model = getattr(Config, 'FACE_DETECTION_MODEL', 'hog')
+        self._yunet = None
+        if self.detection_model == 'yunet':
+            try:
+                self._yunet = cv2.FaceDetectorYN_create(
+                    Config.YUNET_MODEL_PATH, "", (0, 0), score_threshold=0.6
+                )
+                logger.info("YuNet face detector loaded")
+            except Exception as e:
+                logger.warning(f"YuNet unavailable, falling back to HOG: {e}")
+
+        # Optional MediaPipe BlazeFace - similar speed class to YuNet,
+        # useful where the ONNX model file isn't deployed
+        self._mp_detector = None
+        if self.detection_model == 'mediapipe':
+            try:
+                import mediapipe as mp
+                self._mp_detector = mp.solutions.face_detection.FaceDetection(
+                    model_selection=0, min_detection_confidence=0.5
+                )
+                logger.info("MediaPipe face detector loaded")
+            except Exception as e:
+                logger.warning(f"MediaPipe unavailable, falling back to HOG: {e}")
+
+        # Perceptual-hash memo of recent matches - a worker standing in front
+        # of the camera produces near-identical crops frame after frame, so
+        # a cache hit skips the expensive ResNet encode entirely
+        try:
+            self._phash = cv2.img_hash.PHash_create()
+        except AttributeError:
+            self._phash = None  # OpenCV built without the img_hash module
+        self._phash_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._phash_max_distance = 6  # Hamming distance threshold (64-bit hash)
+        self._phash_cache_size = 64
+
+        # dlib loads its model files lazily on the first call - pay those
+        # tens of ms here instead of stalling the first worker's scan.
+        # (The encoder and pose predictor are already bound at import.)
+        try:
+            face_recognition.face_locations(
+                np.zeros((64, 64, 3), dtype=np.uint8),
+                model='hog', number_of_times_to_upsample=0
+            )
+        except Exception as e:
+            logger.debug(f"Detector warmup skipped: {e}")
+
+        # Surface how dlib was compiled - a lowest-common-denominator SSE2
+        # wheel silently costs 2-5x on the HOG and encoder paths
+        # (scripts/build_dlib.sh rebuilds with AVX/NEON)
+        if dlib is not None:
+            logger.info(
+                "dlib build: AVX=%s NEON=%s BLAS=%s",
+                getattr(dlib, 'USE_AVX_INSTRUCTIONS', '?'),
+                getattr(dlib, 'USE_NEON_INSTRUCTIONS', '?'),
+                getattr(dlib, 'DLIB_USE_BLAS', '?'),
+            )
     
     def load_encodings(self) -> int:
         """Load face encodings from database"""
@@ -40,20 +222,24 @@ class FaceRecognizer:
             if encodings and self.sqlite_db:
                 self.sqlite_db.cache_face_encodings(encodings)
         else:
+            # Offline: the binary cache skips the per-row JSON parse
+            if self._load_cache():
+                logger.info(f"Loaded {len(self.known_metadata)} encodings (binary cache)")
+                return len(self.known_metadata)
+
             # Fallback to SQLite
             if self.sqlite_db:
                 encodings = self.sqlite_db.get_cached_encodings()
                 logger.warning("Using cached encodings (offline)")
         
         # Parse encodings
-        self.known_encodings = []
+        rows: List[np.ndarray] = []
         self.known_metadata = []
-        
+
         for enc_data in encodings:
             try:
-                encoding_array = np.array(json.loads(enc_data['encoding_data']))
-                self.known_encodings.append(encoding_array)
-                
+                rows.append(self._parse_encoding(enc_data['encoding_data']))
+
                 self.known_metadata.append({
                     'worker_id': enc_data['worker_id'],
                     'first_name': enc_data['first_name'],
@@ -63,8 +249,185 @@ class FaceRecognizer:
             except Exception as e:
                 logger.error(f"Failed to parse encoding: {e}")
         
-        logger.info(f"Loaded {len(self.known_encodings)} encodings")
-        return len(self.known_encodings)
+        self._build_index(rows)
+        self._save_cache()
+
+        logger.info(f"Loaded {len(self.known_metadata)} encodings")
+        return len(self.known_metadata)
+
+    @staticmethod
+    def _parse_encoding(data: str) -> np.ndarray:
+        """Decode one stored encoding: base64 raw float32, or legacy JSON
+
+        New rows hold base64 of the raw float32 bytes (128 floats, 512
+        bytes) - decoding is a single frombuffer instead of tokenizing a
+        ~3KB JSON array. Rows written before the format change still start
+        with '[' and go through the JSON path.
+        """
+        if data.startswith('['):
+            parsed = orjson.loads(data) if orjson is not None else json.loads(data)
+            return np.asarray(parsed, dtype=np.float32)
+        return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+    @staticmethod
+    def _encode_for_storage(encoding: np.ndarray) -> str:
+        """Serialize an encoding as base64 raw float32 bytes"""
+        return base64.b64encode(
+            np.asarray(encoding, dtype=np.float32).tobytes()
+        ).decode('ascii')
+
+    @staticmethod
+    def _cache_meta_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '_meta.json'
+
+    def _save_cache(self) -> None:
+        """Persist parsed encodings so the next cold start skips JSON parsing"""
+        if self._enc_matrix is None:
+            return
+
+        try:
+            path = Config.ENCODINGS_CACHE_PATH
+            cache_dir = os.path.dirname(path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+
+            # Write to temp files and replace atomically. The matrix is
+            # already float32 C-contiguous, so the next load can mmap it
+            # straight into the scan path without a copy.
+            tmp_path = path + '.tmp.npy'
+            np.save(tmp_path, self._enc_matrix)
+            os.replace(tmp_path, path)
+
+            meta_path = self._cache_meta_path(path)
+            tmp_meta = meta_path + '.tmp'
+            with open(tmp_meta, 'w') as f:
+                json.dump(self.known_metadata, f)
+            os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            logger.warning(f"Failed to write encoding cache: {e}")
+
+    def _load_cache(self) -> bool:
+        """Memory-map encodings from the binary cache, returns True on success"""
+        path = Config.ENCODINGS_CACHE_PATH
+        meta_path = self._cache_meta_path(path)
+        if not os.path.exists(path) or not os.path.exists(meta_path):
+            return False
+
+        try:
+            # mmap: pages fault in on first touch instead of one big read
+            matrix = np.load(path, mmap_mode='r')
+            with open(meta_path) as f:
+                metadata = json.load(f)
+        except Exception as e:
+            logger.warning(f"Encoding cache unreadable: {e}")
+            return False
+
+        if len(matrix) == 0 or len(matrix) != len(metadata):
+            return False
+
+        self.known_metadata = metadata
+        self._build_index(matrix)
+        return True
+
+    def _build_index(self, encodings) -> None:
+        """Pack encodings into the SoA matrix/id arrays and build the BallTree"""
+        self._enc_matrix = None
+        self._enc_ids = None
+        self._enc_sqnorms = None
+        self._balltree = None
+        self._enc_q = None
+        self._enc_scale = 1.0
+
+        # The phash fast path caches identities from the OLD index - after a
+        # reload (worker deactivated/retrained) a stale entry would keep
+        # answering for them, bypassing the rebuilt index entirely
+        self._phash_cache.clear()
+
+        if len(encodings) == 0:
+            return
+
+        # No-op (zero-copy) when given the cached float32 C-contiguous mmap
+        self._enc_matrix = np.ascontiguousarray(
+            np.asarray(encodings, dtype=np.float32)
+        )
+        self._enc_ids = np.array(
+            [m['worker_id'] for m in self.known_metadata], dtype=np.int32
+        )
+
+        # |k_n|^2 terms of the L2 expansion are constant between reloads -
+        # computing them here keeps the batch matcher at one sgemm per call
+        self._enc_sqnorms = np.einsum(
+            'ij,ij->i', self._enc_matrix, self._enc_matrix
+        ).astype(np.float32)
+
+        # Symmetric int8 quantization: one global scale keeps the quantized
+        # space a scaled copy of the original, so Euclidean distances (and
+        # the tolerance threshold) carry over after dividing by the scale
+        max_abs = float(np.abs(self._enc_matrix).max())
+        if max_abs > 0:
+            self._enc_scale = 127.0 / max_abs
+        self._enc_q = np.round(self._enc_matrix * self._enc_scale).astype(np.int8)
+        self._enc_q16 = self._enc_q.astype(np.int16)
+        self._diff_buf = np.empty_like(self._enc_q16)
+
+        try:
+            from sklearn.neighbors import BallTree
+            self._balltree = BallTree(self._enc_matrix, leaf_size=40)
+            logger.info("BallTree index built")
+        except ImportError:
+            pass  # sklearn not installed - linear scan fallback
+
+    def _match_encoding(self, encoding: np.ndarray) -> Tuple[int, float]:
+        """Find the closest known encoding, returning (index, distance)"""
+        if self._balltree is not None:
+            dist, idx = self._balltree.query(encoding.reshape(1, -1), k=1)
+            return int(idx[0, 0]), float(dist[0, 0])
+
+        # simsimd scan: the kernel picks the widest SIMD path the CPU
+        # actually has at import time, independent of how BLAS was built
+        if simsimd is not None:
+            d2 = np.asarray(simsimd.cdist(
+                encoding.reshape(1, -1).astype(np.float32),
+                self._enc_matrix, metric='sqeuclidean'
+            ))[0]
+            idx = int(d2.argmin())
+            return idx, float(np.sqrt(d2[idx]))
+
+        # Numba scan when available: the whole distance + argmin loop runs
+        # as SIMD-vectorized native code, no interpreter or temporaries
+        if _nb_match is not None:
+            idx, d2 = _nb_match(self._enc_matrix, encoding.astype(np.float32))
+            return int(idx), float(np.sqrt(d2))
+
+        # Quantized linear scan: int16 subtract + int32 squared-norm over the
+        # int8 matrix (widening NEON ops); sqrt + rescale only the winner
+        probe_q = np.round(encoding * self._enc_scale).astype(np.int16)
+        diffs = np.subtract(self._enc_q16, probe_q, out=self._diff_buf)
+        squared_distances = np.einsum('ij,ij->i', diffs, diffs, dtype=np.int32)
+        best_match_idx = int(squared_distances.argmin())
+        best_distance = np.sqrt(float(squared_distances[best_match_idx])) / self._enc_scale
+        return best_match_idx, float(best_distance)
+
+    def _match_encodings(self, probes: np.ndarray) -> List[Tuple[int, float]]:
+        """Match several probes at once via one (F,N) distance matrix
+
+        L2 expansion: d2[f,n] = |p_f|^2 + |k_n|^2 - 2 p_f.k_n, so the
+        whole F x N scan collapses into a single BLAS sgemm plus two
+        vector ops - no per-face Python round-trips.
+        """
+        matrix = self._enc_matrix
+        known_sq = self._enc_sqnorms
+        probe_sq = np.einsum('ij,ij->i', probes, probes)
+        d2 = known_sq[None, :] + probe_sq[:, None] - 2.0 * (probes @ matrix.T)
+
+        best = d2.argmin(axis=1)
+        best_d2 = d2[np.arange(len(probes)), best]
+        # Compare in squared space first; sqrt only the within-tolerance
+        # winners (rounding can nudge a near-zero distance negative)
+        dists = np.where(
+            best_d2 <= self._tol2, np.sqrt(np.maximum(best_d2, 0.0)), np.inf
+        )
+        return [(int(i), float(d)) for i, d in zip(best, dists)]
     
     def _load_from_mysql(self) -> List[Dict[str, Any]]:
         """Load from MySQL"""
@@ -92,151 +455,353 @@ class FaceRecognizer:
         Returns:
             (worker_info, annotated_frame, face_box) or (None, frame_with_all_faces, None)
         """
-        if not self.known_encodings:
+        if self._enc_matrix is None:
             return None, frame, None
-        
-        # Resize for speed
-        small_frame = cv2.resize(frame, (0, 0), fx=self.scale_factor, fy=self.scale_factor)
-        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
+
+        # Between detections, just redraw the cached boxes (sub-ms)
+        now = time.monotonic()
+        if now - self._last_detection_time < self.detection_interval:
+            self.draw_cached_faces(frame)
+            return None, frame, None
+        self._last_detection_time = now
+
+        # Resize for speed - into the persistent buffer, no new allocation
+        small_h = int(frame.shape[0] * self.scale_factor)
+        small_w = int(frame.shape[1] * self.scale_factor)
+        if self._small_buf is None or self._small_buf.shape[:2] != (small_h, small_w):
+            self._small_buf = np.empty((small_h, small_w, 3), dtype=np.uint8)
+        small_frame = cv2.resize(frame, (small_w, small_h), dst=self._small_buf)
+
         # Detect ALL faces - FAST mode
-        face_locations = face_recognition.face_locations(
-            rgb_frame, 
-            model='hog',
-            number_of_times_to_upsample=0
-        )
+        face_locations = self._detect_faces(small_frame)
         
         # If no faces found, keep showing last known faces briefly
         if not face_locations:
-            # Draw last known faces (faded)
-            for i, (top, right, bottom, left) in enumerate(self.last_face_locations):
-                if i < len(self.last_face_names):
-                    name = self.last_face_names[i]
-                    cv2.rectangle(frame, (left, top), (right, bottom), (0, 150, 0), 2)
-                    cv2.putText(frame, name, (left, max(25, top - 10)),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 150, 0), 2)
+            self.draw_cached_faces(frame)
             return None, frame, None
-        
-        # Get encodings for detected faces
-        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-        
-        # Scale back to original size
-        scale_reciprocal = 1.0 / self.scale_factor
-        
+
+        # Fuzzy memoization (single-face fast path): reuse a recent match
+        # when the crop hashes close to one we already encoded
+        if len(face_locations) == 1:
+            probe_hash = self._compute_phash(small_frame, face_locations[0])
+            cached_info = self._phash_lookup(probe_hash)
+            if cached_info is not None:
+                worker_info = cached_info.copy()
+                face_box = self._scale_location(face_locations[0])
+                first = worker_info.get("first_name") or ""
+                last = worker_info.get("last_name") or ""
+                name = f"{first} {last}".strip() or "Unknown"
+                self._draw_match(frame, face_box, name)
+
+                self.last_face_locations = [face_box]
+                self.last_face_names = [name]
+                self.last_face_ids = [worker_info.get('worker_id')]
+                self._last_face_infos = [worker_info.copy()]
+                return worker_info, frame, face_box
+
+        # Centroid tracking: a box whose centre lands next to a face we just
+        # identified keeps that identity without re-encoding
+        scaled_boxes = [self._scale_location(b) for b in face_locations]
+        use_tracking = now < self._track_deadline
+        tracked_infos = [
+            self._match_track(box) if use_tracking else None
+            for box in scaled_boxes
+        ]
+
+        # Encode only the faces no track claimed. Detection ran on the small
+        # frame, but the chips are cut from the FULL-resolution frame using
+        # the scaled-back boxes - cheaper detection, undegraded encodings
+        pending = [i for i, info in enumerate(tracked_infos) if info is None]
+        face_encodings = []
+        if pending:
+            if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+                self._rgb_buf = np.empty_like(frame)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            face_encodings = self._encode_faces(
+                rgb_frame, [scaled_boxes[i] for i in pending]
+            )
+            self._track_deadline = now + self.track_timeout
+
+        # Multi-face frames go through one GEMM distance matrix instead of
+        # a per-face scan; a single probe keeps the cheap 1-vs-N path
+        if len(face_encodings) > 1:
+            matches = self._match_encodings(np.asarray(face_encodings, dtype=np.float32))
+        else:
+            matches = [self._match_encoding(e) for e in face_encodings]
+
         first_recognized_worker = None
         first_face_box = None
-        
+
         current_face_locations = []
         current_face_names = []
         current_face_ids = []
-        
+        current_face_infos: List[Optional[Dict[str, Any]]] = []
+
         # Process each face
-        for (top, right, bottom, left), encoding in zip(face_locations, face_encodings):
-            # Scale coordinates
-            top = int(top * scale_reciprocal)
-            right = int(right * scale_reciprocal)
-            bottom = int(bottom * scale_reciprocal)
-            left = int(left * scale_reciprocal)
-            
+        matches_iter = iter(matches)
+        for i, (top, right, bottom, left) in enumerate(scaled_boxes):
             current_face_locations.append((top, right, bottom, left))
-            
-            # Compare with known faces
-            matches = face_recognition.compare_faces(
-                self.known_encodings,
-                encoding,
-                tolerance=self.tolerance
-            )
-            
-            if True not in matches:
-                # Unknown - draw red box CONTINUOUSLY
-                cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 4)
-                
-                # Shadow
-                cv2.putText(frame, "Unknown", (left + 2, max(25, top - 10) + 2),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)
-                # Main text
-                cv2.putText(frame, "Unknown", (left, max(25, top - 10)),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                
-                current_face_names.append("Unknown")
-                current_face_ids.append(None)
-                continue
-            
-            # Best match
-            face_distances = face_recognition.face_distance(
-                self.known_encodings, 
-                encoding
-            )
-            best_match_idx = np.argmin(face_distances)
-            
-            if matches[best_match_idx]:
+
+            worker_info = tracked_infos[i]
+            if worker_info is not None:
+                worker_info = worker_info.copy()
+            else:
+                # Nearest known encoding
+                best_match_idx, best_distance = next(matches_iter)
+
+                if best_distance > self.tolerance:
+                    # Unknown - draw red box CONTINUOUSLY
+                    cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 4)
+
+                    # Shadow
+                    cv2.putText(frame, "Unknown", (left + 2, max(25, top - 10) + 2),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)
+                    # Main text
+                    cv2.putText(frame, "Unknown", (left, max(25, top - 10)),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+
+                    current_face_names.append("Unknown")
+                    current_face_ids.append(None)
+                    current_face_infos.append(None)
+                    continue
+
                 worker_info = self.known_metadata[best_match_idx].copy()
-                confidence = 1 - face_distances[best_match_idx]
+                confidence = 1 - best_distance
                 worker_info['confidence'] = confidence
-                
-                # Draw GREEN box CONTINUOUSLY - THICK and BRIGHT
-                cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 5)
-                
-                # Draw NAME above box
-                first = worker_info.get("first_name") or ""
-                last = worker_info.get("last_name") or ""
-                name = f"{first} {last}".strip() or "Unknown"
-                
-                current_face_names.append(name)
-                current_face_ids.append(worker_info.get('worker_id'))
-                
-                label_y = max(30, top - 10)
-                
-                # Shadow for readability
-                cv2.putText(frame, name, (left + 2, label_y + 2),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 4)
-                # Main text - BRIGHT GREEN
-                cv2.putText(frame, name, (left, label_y),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-                
-                # Store first recognized worker for confirmation system
-                if first_recognized_worker is None:
-                    first_recognized_worker = worker_info
-                    first_face_box = (top, right, bottom, left)
-        
+
+                # Remember the crop hash so the next frames skip the encode
+                self._phash_store(
+                    self._compute_phash(small_frame, face_locations[i]), worker_info
+                )
+
+            # Draw GREEN box + name CONTINUOUSLY - THICK and BRIGHT
+            first = worker_info.get("first_name") or ""
+            last = worker_info.get("last_name") or ""
+            name = f"{first} {last}".strip() or "Unknown"
+            self._draw_match(frame, (top, right, bottom, left), name)
+
+            current_face_names.append(name)
+            current_face_ids.append(worker_info.get('worker_id'))
+            current_face_infos.append(worker_info)
+
+            # Store first recognized worker for confirmation system
+            if first_recognized_worker is None:
+                first_recognized_worker = worker_info
+                first_face_box = (top, right, bottom, left)
+
         # Update cache - ALWAYS maintain tracking
         self.last_face_locations = current_face_locations
         self.last_face_names = current_face_names
         self.last_face_ids = current_face_ids
-        
+        self._last_face_infos = current_face_infos
+
         # Return first recognized worker (if any) for confirmation
         return first_recognized_worker, frame, first_face_box
-    
+
+    def _encode_faces(self, rgb_frame: np.ndarray,
+                      face_locations: List[Tuple[int, int, int, int]]) -> List[np.ndarray]:
+        """Encode faces in batched dlib calls (falls back to the wrapper)
+
+        face_recognition.face_encodings runs the descriptor net once per
+        face; handing dlib a chip list runs them as one batch instead.
+        """
+        if _dlib_encoder is None:
+            return face_recognition.face_encodings(rgb_frame, face_locations)
+
+        batch_size = getattr(Config, 'ENCODING_BATCH_SIZE', 16)
+        encodings: List[np.ndarray] = []
+
+        for start in range(0, len(face_locations), batch_size):
+            chips = []
+            for top, right, bottom, left in face_locations[start:start + batch_size]:
+                rect = dlib.rectangle(left, top, right, bottom)
+                shape = _pose_predictor(rgb_frame, rect)
+                chips.append(dlib.get_face_chip(rgb_frame, shape))
+
+            descriptors = _dlib_encoder.compute_face_descriptor(chips, 0)
+            encodings.extend(np.array(d) for d in descriptors)
+
+        return encodings
+
+    def _match_track(self, box: Tuple[int, int, int, int]) -> Optional[Dict[str, Any]]:
+        """Find a recent identified face whose box overlaps this one (IoU)
+
+        Between detections 0.15s apart a face barely moves, so a strong
+        overlap with an identified box carries the identity forward
+        without re-running the ~20ms encoder. IoU is stricter than the
+        old centroid-radius test: two faces passing close to each other
+        no longer swap identities.
+        """
+        top, right, bottom, left = box
+        area = max(0, right - left) * max(0, bottom - top)
+
+        for prev_box, info in zip(self.last_face_locations, self._last_face_infos):
+            if info is None:
+                continue
+            ptop, pright, pbottom, pleft = prev_box
+            iw = min(right, pright) - max(left, pleft)
+            ih = min(bottom, pbottom) - max(top, ptop)
+            if iw <= 0 or ih <= 0:
+                continue
+            inter = iw * ih
+            parea = (pright - pleft) * (pbottom - ptop)
+            if inter / (area + parea - inter) >= self.track_iou:
+                return info
+        return None
+
+    def _scale_location(self, location: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """Scale a small-frame box back to original frame coordinates"""
+        scale_reciprocal = 1.0 / self.scale_factor
+        top, right, bottom, left = location
+        return (int(top * scale_reciprocal), int(right * scale_reciprocal),
+                int(bottom * scale_reciprocal), int(left * scale_reciprocal))
+
+    def _draw_match(self, frame: np.ndarray, box: Tuple[int, int, int, int], name: str) -> None:
+        """Draw a recognized face box with its name label"""
+        top, right, bottom, left = box
+        cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 5)
+
+        label_y = max(30, top - 10)
+
+        # Shadow for readability
+        cv2.putText(frame, name, (left + 2, label_y + 2),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 4)
+        # Main text - BRIGHT GREEN
+        cv2.putText(frame, name, (left, label_y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+
+    def _compute_phash(self, small_frame: np.ndarray, location: Tuple[int, int, int, int]) -> Optional[bytes]:
+        """64-bit perceptual hash of a face crop (None when unavailable)"""
+        if self._phash is None:
+            return None
+
+        top, right, bottom, left = location
+        roi = small_frame[max(0, top):bottom, max(0, left):right]
+        if roi.size == 0:
+            return None
+
+        roi = cv2.resize(roi, (32, 32), interpolation=cv2.INTER_AREA)
+        return bytes(self._phash.compute(roi).flatten())
+
+    def _phash_lookup(self, probe_hash: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Find a cached match within Hamming distance of the probe hash"""
+        if probe_hash is None:
+            return None
+
+        probe_value = int.from_bytes(probe_hash, 'big')
+        for cached_hash, worker_info in self._phash_cache.items():
+            distance = bin(int.from_bytes(cached_hash, 'big') ^ probe_value).count('1')
+            if distance <= self._phash_max_distance:
+                self._phash_cache.move_to_end(cached_hash)
+                return worker_info
+        return None
+
+    def _phash_store(self, face_hash: Optional[bytes], worker_info: Dict[str, Any]) -> None:
+        """Remember a successful match, evicting the oldest entries (LRU)"""
+        if face_hash is None:
+            return
+
+        self._phash_cache[face_hash] = worker_info.copy()
+        self._phash_cache.move_to_end(face_hash)
+        while len(self._phash_cache) > self._phash_cache_size:
+            self._phash_cache.popitem(last=False)
+
+    def _detect_faces(self, small_frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Detect faces on the downscaled frame, returning (top, right, bottom, left)"""
+        if self._yunet is not None:
+            h, w = small_frame.shape[:2]
+            self._yunet.setInputSize((w, h))
+            _, faces = self._yunet.detect(small_frame)
+            if faces is None:
+                return []
+            locations = []
+            for x, y, fw, fh in faces[:, :4].astype(int):
+                locations.append((max(0, y), min(w, x + fw), min(h, y + fh), max(0, x)))
+            return locations
+
+        if self._mp_detector is not None:
+            h, w = small_frame.shape[:2]
+            results = self._mp_detector.process(
+                cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+            )
+            if not results.detections:
+                return []
+            locations = []
+            for det in results.detections:
+                box = det.location_data.relative_bounding_box
+                left = max(0, int(box.xmin * w))
+                top = max(0, int(box.ymin * h))
+                right = min(w, int((box.xmin + box.width) * w))
+                bottom = min(h, int((box.ymin + box.height) * h))
+                locations.append((top, right, bottom, left))
+            return locations
+
+        # HOG only uses gradients, so feed it grayscale (1/3 the bandwidth)
+        if self._gray_buf is None or self._gray_buf.shape != small_frame.shape[:2]:
+            self._gray_buf = np.empty(small_frame.shape[:2], dtype=np.uint8)
+        gray_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        return face_recognition.face_locations(
+            gray_frame,
+            model='hog',
+            number_of_times_to_upsample=0
+        )
+
+    def draw_cached_faces(self, frame: np.ndarray) -> None:
+        """Draw last known face boxes (faded) to keep tracking smooth"""
+        for i, (top, right, bottom, left) in enumerate(self.last_face_locations):
+            if i < len(self.last_face_names):
+                name = self.last_face_names[i]
+                cv2.rectangle(frame, (left, top), (right, bottom), (0, 150, 0), 2)
+                cv2.putText(frame, name, (left, max(25, top - 10)),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 150, 0), 2)
+
+
     def train_new_face(self, images: List[np.ndarray], worker_id: int) -> bool:
         """Train new face"""
-        encodings = []
-        
         logger.info(f"Training face for worker {worker_id}...")
-        
-        for idx, img in enumerate(images):
-            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            face_locations = face_recognition.face_locations(rgb_img)
-            
-            if not face_locations:
+
+        # Each image is an independent HOG + encode job (~100ms of GIL-free
+        # dlib work), so the batch fans out across cores; serial fallback
+        # if worker processes can't start (low memory)
+        jpg_images = [cv2.imencode('.jpg', img)[1].tobytes() for img in images]
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            workers = min(len(jpg_images), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_encode_training_image, jpg_images))
+        except Exception as e:
+            logger.warning(f"Process pool unavailable, encoding serially: {e}")
+            results = [_encode_training_image(jpg) for jpg in jpg_images]
+
+        payloads = []
+        for idx, (payload, face_count) in enumerate(results):
+            if face_count == 0:
                 logger.warning(f"No face in image {idx+1}")
                 continue
-            
-            if len(face_locations) > 1:
+
+            if face_count > 1:
                 logger.warning(f"Multiple faces in image {idx+1}")
-            
-            face_encodings = face_recognition.face_encodings(rgb_img, face_locations)
-            if face_encodings:
-                encodings.append(face_encodings[0])
+
+            if payload is not None:
+                payloads.append(payload)
                 logger.info(f"✓ Processed image {idx+1}")
-        
+
+        if _dlib_encoder is not None and payloads:
+            # Workers returned aligned chips - one batched net call covers
+            # the whole training set
+            descriptors = _dlib_encoder.compute_face_descriptor(payloads, 0)
+            encodings = [np.array(d) for d in descriptors]
+        else:
+            encodings = payloads
+
         if len(encodings) < 3:
             logger.error(f"Need 3+ images (got {len(encodings)})")
             return False
         
-        # Average encodings
+        # Average encodings - stored as base64 float32 bytes, not JSON
         avg_encoding = np.mean(encodings, axis=0)
-        encoding_json = json.dumps(avg_encoding.tolist())
-        
+        encoding_data = self._encode_for_storage(avg_encoding)
+
         # Store
         if not self.mysql_db or not self.mysql_db.is_connected:
             logger.error("MySQL not connected")
@@ -247,7 +812,7 @@ class FaceRecognizer:
             (worker_id, encoding_data, is_active)
             VALUES (%s, %s, 1)
         """
-        encoding_id = self.mysql_db.execute_query(query, (worker_id, encoding_json))
+        encoding_id = self.mysql_db.execute_query(query, (worker_id, encoding_data))
         
         if encoding_id:
             logger.info(f"✅ Trained worker {worker_id}")
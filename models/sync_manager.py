@@ -14,12 +14,16 @@ class SyncManager:
     def __init__(self, mysql_db: MySQLDatabase, sqlite_db: SQLiteDatabase):
         self.mysql_db = mysql_db
         self.sqlite_db = sqlite_db
-        self.retry_count = {}
     
     def sync_all(self) -> Dict[str, int]:
         """
         Sync all pending records from SQLite to MySQL
-        
+
+        One duplicate-check SELECT covers the whole backlog, then the rows
+        go up as two executemany batches (inserts, time-out updates) - a
+        post-outage backlog costs a handful of round-trips instead of two
+        per record.
+
         Returns:
             {'synced': int, 'failed': int, 'pending': int}
         """
@@ -27,81 +31,89 @@ class SyncManager:
             if not self.mysql_db.connect():
                 logger.warning("Cannot sync: MySQL unavailable")
                 return {'synced': 0, 'failed': 0, 'pending': 0}
-        
-        pending = self.sqlite_db.get_pending_records()
+
+        # Over-retried rows are filtered in SQL via the retry_count column,
+        # so the counter survives restarts and never re-fetches dead rows
+        pending = self.sqlite_db.get_pending_records(Config.MAX_RETRY_ATTEMPTS)
         synced_count = 0
         failed_count = 0
-        
-        for record in pending:
-            buffer_id = record['id']
-            
-            # Check retry limit
-            retry_key = f"buffer_{buffer_id}"
-            if retry_key in self.retry_count:
-                if self.retry_count[retry_key] >= Config.MAX_RETRY_ATTEMPTS:
-                    logger.error(f"Max retries reached for buffer ID {buffer_id}")
-                    failed_count += 1
+
+        if pending:
+            existing = self._fetch_existing(pending)
+
+            to_insert: List[tuple] = []
+            insert_ids: List[int] = []
+            to_update: List[tuple] = []
+            update_ids: List[int] = []
+            synced_ids: List[int] = []
+
+            for record in pending:
+                key = (record['worker_id'], str(record['attendance_date']))
+                attendance_id = existing.get(key)
+
+                if attendance_id is None:
+                    to_insert.append((
+                        record['worker_id'],
+                        record['attendance_date'],
+                        record['time_in'],
+                        record['time_out'],
+                        record['status'],
+                        record['hours_worked']
+                    ))
+                    insert_ids.append(record['id'])
+                elif record['time_out']:
+                    to_update.append((
+                        record['time_out'], record['hours_worked'], attendance_id
+                    ))
+                    update_ids.append(record['id'])
+                else:
+                    # Server already has the time-in; nothing to push
+                    synced_ids.append(record['id'])
+
+            for rows, buffer_ids, query in (
+                (to_insert, insert_ids, """
+                    INSERT INTO attendance
+                    (worker_id, attendance_date, time_in, time_out, status, hours_worked)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """),
+                (to_update, update_ids, """
+                    UPDATE attendance
+                    SET time_out = %s, hours_worked = %s, updated_at = NOW()
+                    WHERE attendance_id = %s AND time_out IS NULL
+                """),
+            ):
+                if not rows:
                     continue
-            
-            # Sync record
-            success = self._sync_record(record)
-            
-            if success:
+                if self.mysql_db.execute_many(query, rows):
+                    synced_ids.extend(buffer_ids)
+                else:
+                    failed_count += len(buffer_ids)
+                    for buffer_id in buffer_ids:
+                        self.sqlite_db.increment_retry(buffer_id)
+
+            for buffer_id in synced_ids:
                 self.sqlite_db.mark_synced(buffer_id)
-                synced_count += 1
-                
-                # Clear retry count
-                if retry_key in self.retry_count:
-                    del self.retry_count[retry_key]
-            else:
-                failed_count += 1
-                
-                # Increment retry count
-                self.retry_count[retry_key] = self.retry_count.get(retry_key, 0) + 1
-        
+            synced_count = len(synced_ids)
+
         remaining = len(pending) - synced_count - failed_count
-        
+
         logger.info(f"Sync complete: {synced_count} synced, {failed_count} failed, {remaining} pending")
         return {'synced': synced_count, 'failed': failed_count, 'pending': remaining}
-    
-    def _sync_record(self, record: Dict[str, Any]) -> bool:
-        """Sync single attendance record to MySQL"""
-        try:
-            # Check if record already exists (prevent duplicates)
-            existing = self.mysql_db.fetch_one("""
-                SELECT attendance_id FROM attendance
-                WHERE worker_id = %s AND attendance_date = %s
-                AND is_archived = 0
-            """, (record['worker_id'], record['attendance_date']))
-            
-            if existing:
-                # Update existing record
-                if record['time_out']:
-                    self.mysql_db.execute_query("""
-                        UPDATE attendance
-                        SET time_out = %s, hours_worked = %s, updated_at = NOW()
-                        WHERE attendance_id = %s AND time_out IS NULL
-                    """, (record['time_out'], record['hours_worked'], existing['attendance_id']))
-                
-                logger.info(f"Updated existing attendance {existing['attendance_id']}")
-            else:
-                # Insert new record
-                self.mysql_db.execute_query("""
-                    INSERT INTO attendance
-                    (worker_id, attendance_date, time_in, time_out, status, hours_worked)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (
-                    record['worker_id'],
-                    record['attendance_date'],
-                    record['time_in'],
-                    record['time_out'],
-                    record['status'],
-                    record['hours_worked']
-                ))
-                
-                logger.info(f"Inserted new attendance for worker {record['worker_id']}")
-            
-            return True
-        except Exception as e:
-            logger.error(f"Sync failed for buffer ID {record['id']}: {e}")
-            return False
\ No newline at end of file
+
+    def _fetch_existing(self, records: List[Dict[str, Any]]) -> Dict[tuple, int]:
+        """Map (worker_id, date) -> attendance_id for every pending row at once"""
+        placeholders = ', '.join(['(%s, %s)'] * len(records))
+        params: List[Any] = []
+        for record in records:
+            params.extend((record['worker_id'], record['attendance_date']))
+
+        rows = self.mysql_db.fetch_all(f"""
+            SELECT attendance_id, worker_id, attendance_date FROM attendance
+            WHERE is_archived = 0
+            AND (worker_id, attendance_date) IN ({placeholders})
+        """, tuple(params))
+
+        return {
+            (row['worker_id'], str(row['attendance_date'])): row['attendance_id']
+            for row in rows
+        }
\ No newline at end of file
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""One-shot migration: face_encodings rows from JSON to base64 float32
+
+Older rows store the 128-d encoding as a JSON array (~3KB of text per
+row); new rows store base64 of the raw float32 bytes (~684 chars). The
+loader accepts both, so running this is optional - it just makes every
+startup parse the cheap format.
+
+Usage (from the project root):
+    python scripts/migrate_encodings.py
+"""
+
+import base64
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import MySQLDatabase
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    db = MySQLDatabase()
+    if not db.connect():
+        logger.error("MySQL connection failed - nothing migrated")
+        return 1
+
+    rows = db.fetch_all("SELECT encoding_id, encoding_data FROM face_encodings")
+    migrated = 0
+    skipped = 0
+
+    for row in rows:
+        data = row['encoding_data']
+        if not data.startswith('['):
+            skipped += 1  # already base64
+            continue
+
+        try:
+            encoding = np.asarray(json.loads(data), dtype=np.float32)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Row {row['encoding_id']} unparseable, left as-is: {e}")
+            continue
+
+        encoded = base64.b64encode(encoding.tobytes()).decode('ascii')
+        db.execute_query(
+            "UPDATE face_encodings SET encoding_data = %s WHERE encoding_id = %s",
+            (encoded, row['encoding_id'])
+        )
+        migrated += 1
+
+    db.close()
+    logger.info(f"Migrated {migrated} rows, {skipped} already binary")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+-- Stored procedures for the attendance hot path.
+--
+-- Each scan used to cost two round-trips (attendance INSERT/UPDATE plus
+-- activity_logs INSERT); these fold both into one server-side call.
+-- Deploy with:  mysql construction_management < sql/procedures.sql
+-- The Python side falls back to plain statements when these are missing.
+
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS sp_log_timein //
+CREATE PROCEDURE sp_log_timein(
+    IN p_worker_id INT,
+    IN p_date DATE,
+    IN p_time_in TIME,
+    OUT p_attendance_id INT
+)
+BEGIN
+    INSERT INTO attendance (worker_id, attendance_date, time_in, status)
+    VALUES (p_worker_id, p_date, p_time_in, 'present');
+
+    SET p_attendance_id = LAST_INSERT_ID();
+
+    INSERT INTO activity_logs (action, table_name, record_id, description, ip_address)
+    VALUES ('clock_in', 'attendance', p_attendance_id,
+            'Facial recognition time-in', 'raspberry_pi');
+END //
+
+DROP PROCEDURE IF EXISTS sp_log_timeout //
+CREATE PROCEDURE sp_log_timeout(
+    IN p_attendance_id INT,
+    IN p_time_out TIME,
+    IN p_hours_worked DECIMAL(5,2)
+)
+BEGIN
+    UPDATE attendance
+    SET time_out = p_time_out, hours_worked = p_hours_worked, updated_at = NOW()
+    WHERE attendance_id = p_attendance_id;
+
+    INSERT INTO activity_logs (action, table_name, record_id, description, ip_address)
+    VALUES ('clock_out', 'attendance', p_attendance_id,
+            'Facial recognition time-out', 'raspberry_pi');
+END //
+
+DELIMITER ;
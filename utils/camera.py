@@ -1,9 +1,16 @@
 import cv2
 import logging
-from threading import Thread, Lock
+import os
+import sys
+from threading import Thread, Lock, Condition
 from typing import Optional, Tuple
 import numpy as np
 
+try:
+    from picamera2 import Picamera2  # Pi camera via DMA buffers (no V4L2 memcpy)
+except ImportError:
+    Picamera2 = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,33 +20,70 @@ class Camera:
     def __init__(self, camera_index: int = 0):
         self.camera_index = camera_index
         self.cap: Optional[cv2.VideoCapture] = None
+        self.picam = None
         self.frame: Optional[np.ndarray] = None
         self.ret = False
         self.is_running = False
-        
-        # Threading
+
+        # Threading - the single-slot latest-frame buffer gives drop-oldest
+        # semantics; the sequence counter lets readers wait for a NEW frame
         self.lock = Lock()
         self.thread: Optional[Thread] = None
-    
+        self._frame_ready = Condition(self.lock)
+        self._frame_seq = 0
+        self._consumed_seq = 0
+
+        # Driver-reported (width, height, fps) - each cap.get() can
+        # round-trip to the driver, so query once and invalidate on set
+        self._settings: Optional[Tuple[int, int, int]] = None
+
     def initialize(self) -> bool:
         """Initialize camera"""
+        # Prefer picamera2 on the Pi - frames come out of GPU DMA buffers
+        # instead of going through a V4L2 userspace memcpy
+        if Picamera2 is not None and self._init_picamera():
+            return True
+
         try:
-            logger.info(f"Opening camera {self.camera_index}...")
-            
-            # Use CAP_ANY (works best based on your test)
-            self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_ANY)
+            logger.info("Opening camera %s...", self.camera_index)
             
+            # Platform-native backend: skips OpenCV's backend probing and
+            # actually honors the FourCC request below
+            if sys.platform.startswith('linux'):
+                backend = cv2.CAP_V4L2
+            elif sys.platform == 'win32':
+                backend = cv2.CAP_DSHOW
+            elif sys.platform == 'darwin':
+                backend = cv2.CAP_AVFOUNDATION
+            else:
+                backend = cv2.CAP_ANY
+
+            self.cap = cv2.VideoCapture(self.camera_index, backend)
+            if not self.cap.isOpened() and backend != cv2.CAP_ANY:
+                logger.warning("Native backend failed, retrying with CAP_ANY")
+                self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_ANY)
+
             if not self.cap.isOpened():
                 logger.error("Failed to open camera")
                 return False
-            
+
             logger.info("Camera opened successfully")
-            
+
+            # MJPG must be requested BEFORE resolution/FPS: compressed
+            # transport is 5-10x less USB bandwidth than raw YUYV, which is
+            # what lets 640x480@30 fit comfortably through USB 2.0
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+
             # Set properties
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimal buffer
+
+            # Report what the driver actually granted, not what we asked for
+            fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC)) & 0xFFFFFFFF
+            fourcc_str = fourcc.to_bytes(4, 'little').decode('ascii', 'replace')
+            logger.info("Pixel format: %s", fourcc_str)
             
             # Test read
             ret, frame = self.cap.read()
@@ -52,56 +96,169 @@ class Camera:
             self.thread = Thread(target=self._read_frames, daemon=True)
             self.thread.start()
             
+            width, height, fps = self.get_settings()
             logger.info("Camera initialized")
-            logger.info(f"Resolution: {int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}")
-            logger.info(f"FPS: {int(self.cap.get(cv2.CAP_PROP_FPS))}")
-            
+            logger.info("Resolution: %dx%d", width, height)
+            logger.info("FPS: %d", fps)
+
             return True
         
         except Exception as e:
-            logger.exception(f"Camera error: {e}")
+            # error() not exception(): a failed open is a clean, expected
+            # condition - capturing a traceback for it is pure overhead
+            logger.error("Camera error: %s", e)
             return False
     
+    def _init_picamera(self) -> bool:
+        """Initialize via picamera2 (zero-copy DMA buffers)"""
+        try:
+            self.picam = Picamera2()
+            config = self.picam.create_preview_configuration(
+                # libcamera format names are little-endian DRM: "RGB888" is
+                # the one that lands as B,G,R in memory, which is what cv2
+                # and the rest of the pipeline expect
+                main={"size": (640, 480), "format": "RGB888"},
+                buffer_count=4  # ISP fills N+1 while we process N
+            )
+            self.picam.configure(config)
+            self.picam.start()
+
+            # Same threaded latest-frame contract as the OpenCV path
+            self.is_running = True
+            self.thread = Thread(target=self._read_frames, daemon=True)
+            self.thread.start()
+
+            logger.info("Camera initialized (picamera2, 640x480)")
+            return True
+
+        except Exception as e:
+            logger.warning("picamera2 unavailable: %s", e)
+            self.picam = None
+            return False
+
     def _read_frames(self):
-        """Background thread for reading frames"""
+        """Background thread for reading frames
+
+        Frames are published by reference swap: a fresh array comes back
+        from every capture call and this thread never mutates one after
+        publishing it, so the assignment is safe under the GIL alone. The
+        condition lock only guards the sequence counter and the wakeup.
+        """
+        # Best-effort: pin the reader to core 0 and nudge its priority so
+        # HOG/encoding bursts on the other cores can't starve capture.
+        # Linux-only and may be denied - degrade silently either way.
+        try:
+            os.sched_setaffinity(0, {0})
+        except (AttributeError, OSError):
+            pass
+        try:
+            os.nice(-5)
+        except (AttributeError, OSError):
+            pass
+
         while self.is_running:
-            if self.cap and self.cap.isOpened():
+            if self.picam is not None:
+                frame = self.picam.capture_array("main")
+                ret = frame is not None
+            elif self.cap and self.cap.isOpened():
                 ret, frame = self.cap.read()
-                
-                with self.lock:
-                    self.ret = ret
-                    self.frame = frame
-    
-    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
-        """Get latest frame (non-blocking)"""
-        with self.lock:
-            if self.frame is not None:
-                return self.ret, self.frame.copy()
             else:
-                return False, None
+                continue
+
+            self.ret = ret
+            self.frame = frame
+            with self._frame_ready:
+                self._frame_seq += 1
+                self._frame_ready.notify_all()
+
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Get latest frame (non-blocking, zero-copy)
+
+        Returns the published array itself - treat it as read-only; use
+        read_into for a private mutable copy.
+        """
+        frame = self.frame
+        if frame is not None:
+            return self.ret, frame
+        return False, None
+
+    def read_into(self, out: np.ndarray) -> bool:
+        """Copy latest frame into a caller-owned buffer (no allocation)"""
+        frame = self.frame
+        if frame is None or frame.shape != out.shape:
+            return False
+        np.copyto(out, frame)
+        return self.ret
+
+    def read_new_into(self, out: np.ndarray, timeout: float = 0.1) -> bool:
+        """Block until a frame newer than the last one consumed arrives
+
+        Pacing the caller off the camera this way means every iteration sees
+        a fresh frame - no sleep-based pacer, no reprocessing stale frames.
+        """
+        with self._frame_ready:
+            if self._frame_seq == self._consumed_seq:
+                self._frame_ready.wait(timeout)
+
+            if self._frame_seq == self._consumed_seq:
+                return False  # timed out - nothing new arrived
+
+            self._consumed_seq = self._frame_seq
+            frame = self.frame
+            ret = self.ret
+
+        # The ~900KB memcpy runs outside the lock - published arrays are
+        # immutable by contract, so the snapshot can't change under us
+        if frame is None or frame.shape != out.shape:
+            return False
+        np.copyto(out, frame)
+        return ret
     
+    def get_settings(self) -> Tuple[int, int, int]:
+        """Driver-reported (width, height, fps), queried once then cached"""
+        if self._settings is None and self.cap:
+            self._settings = (
+                int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                int(self.cap.get(cv2.CAP_PROP_FPS)),
+            )
+        return self._settings or (0, 0, 0)
+
     def set_resolution(self, width: int, height: int):
         """Set resolution"""
         if self.cap:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-            logger.info(f"Resolution set to {width}x{height}")
-    
+            self._settings = None  # re-query what the driver granted
+            logger.info("Resolution set to %dx%d", width, height)
+
     def set_fps(self, fps: int):
         """Set FPS"""
         if self.cap:
             self.cap.set(cv2.CAP_PROP_FPS, fps)
-            logger.info(f"FPS set to {fps}")
+            self._settings = None
+            logger.info("FPS set to %d", fps)
     
     def release(self):
         """Release camera"""
         logger.info("Releasing camera...")
         self.is_running = False
+
+        # Wake any reader blocked waiting for a new frame
+        with self._frame_ready:
+            self._frame_ready.notify_all()
         
         if self.thread:
             self.thread.join(timeout=2)
         
+        if self.picam is not None:
+            try:
+                self.picam.stop()
+                self.picam.close()
+            except Exception:
+                pass
+
         if self.cap:
             self.cap.release()
-        
+
         logger.info("Camera released")
\ No newline at end of file
@@ -1,17 +1,40 @@
 import cv2
 import numpy as np
 import logging
+import time
+from collections import OrderedDict
+from threading import Lock
 from typing import Tuple
 
 logger = logging.getLogger(__name__)
 
+__all__ = ['Display']
+
 
 class Display:
     """Optimized display handler"""
-    
+
     def __init__(self):
         self.window_name = "TrackSite Attendance"
         self.window_created = False
+
+        # Pre-rendered text sprites - Hershey rasterization is ~300us per
+        # putText, a masked ROI blit is ~20us. LRU-bounded because the
+        # status clock mints a new string every second. Locked: both the
+        # display worker and the main loop blit through this cache, and an
+        # unsynchronized move_to_end racing an eviction raises KeyError.
+        self._sprite_cache: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray, int]]" = OrderedDict()
+        self._sprite_cache_size = 128
+        self._sprite_lock = Lock()
+
+        # Reused bar-sized black tile for the status bar blend - only the
+        # bar's rows are ever touched, never the full frame
+        self._overlay_buf: np.ndarray = None
+
+        # Window visibility, re-polled at most once per second - imshow
+        # still uploads the full frame even when nobody can see it
+        self._visible = True
+        self._next_visibility_poll = 0.0
     
     def create_window(self, fullscreen: bool = False):
         """Create display window"""
@@ -35,8 +58,21 @@ class Display:
             logger.error(f"Window creation failed: {e}")
     
     def show_frame(self, frame: np.ndarray):
-        """Display frame"""
-        if self.window_created:
+        """Display frame (skipped while the window is hidden/minimized)"""
+        if not self.window_created:
+            return
+
+        now = time.monotonic()
+        if now >= self._next_visibility_poll:
+            self._next_visibility_poll = now + 1.0
+            try:
+                self._visible = cv2.getWindowProperty(
+                    self.window_name, cv2.WND_PROP_VISIBLE
+                ) >= 1
+            except cv2.error:
+                self._visible = True  # backend without visibility support
+
+        if self._visible:
             cv2.imshow(self.window_name, frame)
     
     def wait_key(self, delay: int = 1) -> int:
@@ -63,27 +99,22 @@ class Display:
         """Add status bar"""
         height, width = frame.shape[:2]
         
-        # Semi-transparent bar
-        overlay = frame.copy()
+        # Semi-transparent bar: blend only the bar's rows against a reused
+        # black tile - the other 90% of the frame is never read or written
         bar_height = 50
-        cv2.rectangle(overlay, (0, height - bar_height), (width, height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
-        # Text
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.7
-        thickness = 2
+        bar = frame[height - bar_height:height]
+        if self._overlay_buf is None or self._overlay_buf.shape != bar.shape:
+            self._overlay_buf = np.zeros_like(bar)
+        cv2.addWeighted(self._overlay_buf, 0.7, bar, 0.3, 0, bar)
         
+        # Text - blitted from the sprite cache (rasterized once per second,
+        # when the clock string changes)
         text_x = 15
         text_y = height - (bar_height // 2) + 8
-        
-        # Shadow
-        cv2.putText(frame, status_text, (text_x + 1, text_y + 1),
-                   font, font_scale, (0, 0, 0), thickness + 1)
-        # Main text
-        cv2.putText(frame, status_text, (text_x, text_y),
-                   font, font_scale, (255, 255, 255), thickness)
-        
+
+        self.blit_text(frame, status_text, (text_x, text_y),
+                       color=(255, 255, 255), font_scale=0.7, thickness=2)
+
         return frame
     
     def add_overlay(self, 
@@ -116,6 +147,57 @@ class Display:
         
         return frame
     
+    def blit_text(self,
+                  frame: np.ndarray,
+                  text: str,
+                  position: Tuple[int, int],
+                  color: Tuple[int, int, int] = (255, 255, 255),
+                  font_scale: float = 1.0,
+                  thickness: int = 2) -> np.ndarray:
+        """Blit pre-rendered text with shadow (same position semantics as putText)"""
+        key = (text, color, font_scale, thickness)
+        with self._sprite_lock:
+            sprite = self._sprite_cache.get(key)
+            if sprite is None:
+                sprite = self._render_sprite(text, color, font_scale, thickness)
+                self._sprite_cache[key] = sprite
+                while len(self._sprite_cache) > self._sprite_cache_size:
+                    self._sprite_cache.popitem(last=False)
+            else:
+                self._sprite_cache.move_to_end(key)
+
+        tile, mask, text_height = sprite
+        x, y = position
+
+        # Tile origin maps to the putText baseline origin
+        y0 = max(0, y - text_height)
+        x0 = max(0, x)
+        roi = frame[y0:y0 + tile.shape[0], x0:x0 + tile.shape[1]]
+
+        roi_h, roi_w = roi.shape[:2]
+        sub_mask = mask[:roi_h, :roi_w]
+        roi[sub_mask] = tile[:roi_h, :roi_w][sub_mask]
+
+        return frame
+
+    def _render_sprite(self,
+                       text: str,
+                       color: Tuple[int, int, int],
+                       font_scale: float,
+                       thickness: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Rasterize text once into a tile + mask pair"""
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness + 2)
+
+        tile = np.zeros((text_h + baseline + 2, text_w + 2, 3), dtype=np.uint8)
+
+        # Shadow (near-black so it survives the mask) then main text
+        cv2.putText(tile, text, (2, text_h + 2), font, font_scale, (10, 10, 10), thickness + 2)
+        cv2.putText(tile, text, (0, text_h), font, font_scale, color, thickness)
+
+        mask = tile.any(axis=2)
+        return tile, mask, text_h
+
     def destroy(self):
         """Destroy window"""
         if self.window_created:
@@ -0,0 +1,55 @@
+import cv2
+import logging
+import numpy as np
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class VideoStreamer:
+    """Streams annotated frames over RTP via the Pi's hardware H.264 encoder"""
+
+    def __init__(self, host: str, port: int,
+                 resolution: Tuple[int, int] = (640, 480), fps: int = 30):
+        self.host = host
+        self.port = port
+        self.resolution = resolution
+        self.fps = fps
+        self.writer: Optional[cv2.VideoWriter] = None
+
+    def initialize(self) -> bool:
+        """Open the GStreamer pipeline (v4l2h264enc offloads to bcm2835-codec)"""
+        pipeline = (
+            "appsrc ! videoconvert ! v4l2h264enc ! h264parse ! "
+            f"rtph264pay ! udpsink host={self.host} port={self.port}"
+        )
+
+        try:
+            self.writer = cv2.VideoWriter(
+                pipeline, cv2.CAP_GSTREAMER, 0, self.fps, self.resolution
+            )
+
+            if not self.writer.isOpened():
+                logger.warning("Stream pipeline failed to open")
+                self.writer = None
+                return False
+
+            logger.info(f"Streaming H.264 to {self.host}:{self.port}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Streaming unavailable: {e}")
+            self.writer = None
+            return False
+
+    def write(self, frame: np.ndarray) -> None:
+        """Push one frame into the encoder (no-op when not streaming)"""
+        if self.writer is not None:
+            self.writer.write(frame)
+
+    def release(self) -> None:
+        """Close the pipeline"""
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+            logger.info("Stream released")